@@ -0,0 +1,22 @@
+"""add posts keyset pagination index
+
+Revision ID: 002_posts_keyset_index
+Revises: 001_initial
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002_posts_keyset_index'
+down_revision = '001_initial'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Composite index backing cursor pagination ordered by (created_at, id)
+    op.create_index('ix_posts_created_at_id', 'posts', ['created_at', 'id'], unique=False)
+
+def downgrade() -> None:
+    op.drop_index('ix_posts_created_at_id', table_name='posts')
@@ -0,0 +1,27 @@
+"""add per-author feed index on posts
+
+Revision ID: 004_posts_author_feed_index
+Revises: 003_posts_full_text_search
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004_posts_author_feed_index'
+down_revision = '003_posts_full_text_search'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Serves WHERE author_id = ? ORDER BY created_at DESC, id DESC as an index range scan
+    op.create_index(
+        'ix_posts_author_id_created_at_id',
+        'posts',
+        ['author_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+
+def downgrade() -> None:
+    op.drop_index('ix_posts_author_id_created_at_id', table_name='posts')
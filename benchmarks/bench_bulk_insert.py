@@ -0,0 +1,77 @@
+"""Compare per-row post creation with the multi-row bulk path.
+
+Runs against a throwaway file-backed SQLite database by default, where the
+bulk path falls back to one INSERT per row in a single transaction; point
+BENCH_DATABASE_URL at PostgreSQL to measure real multi-row statements. DATABASE_URL
+is always overridden so the benchmark never touches the app database:
+
+    python -m benchmarks.bench_bulk_insert --rows 5000 --chunk-size 500
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.harness import bench_tmpdir, use_bench_database
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    return parser.parse_args()
+
+async def run(rows: int, chunk_size: int) -> dict:
+    from sqlalchemy import delete, select
+
+    from src.auth.models import User
+    from src.core.database import AsyncSessionLocal, Base, async_engine
+    from src.posts import models, schemas, service
+
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    posts = [
+        schemas.PostCreate(title=f"Bench post {i}", content=f"Benchmark content {i}")
+        for i in range(rows)
+    ]
+    async with AsyncSessionLocal() as db:
+        user = (await db.execute(select(User).where(User.email == "bench@example.com"))).scalar_one_or_none()
+        if user is None:
+            user = User(email="bench@example.com", username="bench", hashed_password="x")
+            db.add(user)
+            await db.commit()
+        await db.execute(delete(models.Post).where(models.Post.author_id == user.id))
+        await db.commit()
+
+        start = time.perf_counter()
+        for post in posts:
+            await service.create_post(db, post, user_id=user.id)
+        per_row = time.perf_counter() - start
+
+        await db.execute(delete(models.Post).where(models.Post.author_id == user.id))
+        await db.commit()
+
+        start = time.perf_counter()
+        await service.create_posts_bulk(db, posts, user_id=user.id, chunk_size=chunk_size)
+        bulk = time.perf_counter() - start
+
+    await async_engine.dispose()
+    return {
+        "rows": rows,
+        "chunk_size": chunk_size,
+        "per_row_seconds": per_row,
+        "bulk_seconds": bulk,
+        "per_row_rows_per_second": rows / per_row,
+        "bulk_rows_per_second": rows / bulk,
+        "speedup": per_row / bulk,
+    }
+
+def main():
+    args = parse_args()
+    with bench_tmpdir() as tmpdir:
+        use_bench_database(tmpdir)
+        result = asyncio.run(run(args.rows, args.chunk_size))
+    for key, value in result.items():
+        print(f"{key:>26}: {value:.4f}" if isinstance(value, float) else f"{key:>26}: {value}")
+
+if __name__ == "__main__":
+    main()
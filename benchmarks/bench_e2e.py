@@ -0,0 +1,76 @@
+"""End-to-end benchmarks of every endpoint through the in-process ASGI app.
+
+Part of the suite run by ``python -m benchmarks.run --suite e2e``.
+"""
+import itertools
+from typing import Any, Dict, List
+
+from benchmarks.harness import BenchResult, measure
+
+async def run(seeded: Dict[str, Any], min_time: float) -> List[BenchResult]:
+    import httpx
+
+    from src.core.config import settings
+    from src.main import app
+
+    api = settings.API_V1_STR
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post(f"{api}/auth/token", data={
+            "username": seeded["username"], "password": seeded["password"]
+        })
+        response.raise_for_status()
+        auth = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        first_page = (await client.get(f"{api}/posts/cursor", params={"size": 20})).json()
+        post_id = first_page["items"][0]["id"]
+        user_id = seeded["user_id"]
+
+        async def get(path: str, **kwargs):
+            response = await client.get(path, **kwargs)
+            response.raise_for_status()
+            return response
+
+        async def post(path: str, **kwargs):
+            response = await client.post(path, **kwargs)
+            response.raise_for_status()
+            return response
+
+        # Reads run first so the writes below don't change the data they see
+        reads = [
+            ("GET /", "/", {}),
+            ("GET /posts/", f"{api}/posts/", {"params": {"size": 20}}),
+            ("GET /posts/?count=estimate", f"{api}/posts/", {"params": {"size": 20, "count": "estimate"}}),
+            ("GET /posts/?count=none", f"{api}/posts/", {"params": {"size": 20, "count": "none"}}),
+            ("GET /posts/ (deep page)", f"{api}/posts/", {"params": {"size": 20, "page": 40, "count": "none"}}),
+            ("GET /posts/cursor", f"{api}/posts/cursor", {"params": {"size": 20}}),
+            ("GET /posts/cursor (next page)", f"{api}/posts/cursor", {"params": {"size": 20, "cursor": first_page["next_cursor"]}}),
+            ("GET /posts/search", f"{api}/posts/search", {"params": {"q": "database", "size": 10}}),
+            ("GET /posts/export", f"{api}/posts/export", {}),
+            ("GET /posts/{post_id}", f"{api}/posts/{post_id}", {}),
+            ("GET /users/{user_id}/posts", f"{api}/users/{user_id}/posts", {"params": {"size": 20}}),
+            ("GET /me/posts", f"{api}/me/posts", {"params": {"size": 20}, "headers": auth}),
+            ("GET /metrics", settings.METRICS_PATH, {}),
+        ]
+        for name, path, kwargs in reads:
+            results.append(await measure(f"e2e.{name}", lambda: get(path, **kwargs), min_time=min_time))
+
+        users = itertools.count()
+        post_body = {"title": "Benchmark post", "content": "Benchmark content " * 10}
+        bulk_body = [post_body] * 50
+
+        def register():
+            n = next(users)
+            return post(f"{api}/auth/register", json={
+                "email": f"load{n}@example.com", "username": f"load{n}", "password": seeded["password"]
+            })
+
+        results.append(await measure("e2e.POST /posts/", lambda: post(f"{api}/posts/", json=post_body, headers=auth), min_time=min_time))
+        results.append(await measure("e2e.POST /posts/bulk (50)", lambda: post(f"{api}/posts/bulk", json=bulk_body, headers=auth), min_time=min_time))
+        results.append(await measure("e2e.POST /auth/register", register, min_time=min_time, min_iterations=3, warmup=1))
+        results.append(await measure(
+            "e2e.POST /auth/token",
+            lambda: post(f"{api}/auth/token", data={"username": seeded["username"], "password": seeded["password"]}),
+            min_time=min_time, min_iterations=3, warmup=1
+        ))
+    return results
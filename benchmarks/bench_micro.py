@@ -0,0 +1,76 @@
+"""Microbenchmarks: password hashing, JWTs, PostPage serialization and post services.
+
+Part of the suite run by ``python -m benchmarks.run --suite micro``.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from benchmarks.harness import BENCH_PASSWORD, BenchResult, measure
+
+async def run(seeded: Dict[str, Any], min_time: float) -> List[BenchResult]:
+    from jose import jwt
+    from pydantic import TypeAdapter
+
+    from src.core.config import settings
+    from src.core.database import AsyncSessionLocal
+    from src.core.security import (
+        _hashpw, create_access_token, decode_access_token, get_password_hash, verify_password
+    )
+    from src.posts import schemas, service
+
+    results = []
+    hashed = _hashpw(BENCH_PASSWORD)
+    token = create_access_token({"sub": seeded["username"]}, expires_delta=timedelta(minutes=30))
+    # bcrypt is deliberately slow; a handful of iterations is enough
+    results.append(await measure("security.get_password_hash", lambda: get_password_hash(BENCH_PASSWORD), min_time=min_time, min_iterations=3, warmup=1))
+    results.append(await measure("security.verify_password", lambda: verify_password(BENCH_PASSWORD, hashed), min_time=min_time, min_iterations=3, warmup=1))
+    results.append(await measure("security.create_access_token", lambda: create_access_token({"sub": seeded["username"]}), min_time=min_time))
+    results.append(await measure("security.decode_token", lambda: decode_access_token(token), min_time=min_time))
+    # python-jose's generic path, which TokenCodec replaces
+    claims = {"sub": seeded["username"], "exp": datetime.utcnow() + timedelta(minutes=15)}
+    results.append(await measure("security.create_access_token.jose", lambda: jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM), min_time=min_time))
+    results.append(await measure("security.decode_token.jose", lambda: jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]), min_time=min_time))
+
+    async with AsyncSessionLocal() as db:
+        rows = await service.get_posts(db, limit=100)
+        page = {"items": rows, "total": len(rows), "page": 1, "size": 100, "pages": 1}
+        adapter = TypeAdapter(schemas.PostPage)
+        results.append(await measure(
+            "schemas.PostPage.model_dump_json",
+            lambda: schemas.PostPage.model_validate(page, from_attributes=True).model_dump_json(),
+            min_time=min_time
+        ))
+        results.append(await measure(
+            "schemas.PostPage.type_adapter_dump_json",
+            lambda: adapter.dump_json(adapter.validate_python(page, from_attributes=True)),
+            min_time=min_time
+        ))
+
+        post_id = rows[0].id
+
+        async def get_post_uncached():
+            await service.invalidate_post(post_id)
+            return await service.get_post(db, post_id)
+
+        async def keyset_second_page():
+            _, next_cursor, _ = await service.get_posts_keyset(db, limit=20)
+            return await service.get_posts_keyset(db, cursor=next_cursor, limit=20)
+
+        async def search():
+            try:
+                return await service.search_posts(db, q="database", limit=10)
+            except NotImplementedError:
+                return None
+
+        async def export_all():
+            async for _ in service.stream_posts(db):
+                pass
+
+        results.append(await measure("service.get_post.cached", lambda: service.get_post(db, post_id), min_time=min_time))
+        results.append(await measure("service.get_post.uncached", get_post_uncached, min_time=min_time))
+        results.append(await measure("service.get_posts.100", lambda: service.get_posts(db, limit=100), min_time=min_time))
+        results.append(await measure("service.count_posts", lambda: service.count_posts(db), min_time=min_time))
+        results.append(await measure("service.get_posts_keyset.20", keyset_second_page, min_time=min_time))
+        results.append(await measure("service.search_posts", search, min_time=min_time))
+        results.append(await measure("service.stream_posts", export_all, min_time=min_time, min_iterations=3))
+    return results
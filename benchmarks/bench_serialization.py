@@ -0,0 +1,93 @@
+"""Compare FastAPI's default response serialization with FastJSONRoute.
+
+Both apps return the same 100-item PostPage of ORM rows; requests go
+through the full ASGI stack in-process:
+
+    python -m benchmarks.bench_serialization --items 100 --requests 2000
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    return parser.parse_args()
+
+def build_page(items: int) -> dict:
+    from src.auth.models import User  # noqa: F401  (registers the relationship target)
+    from src.posts.models import Post
+
+    now = datetime.utcnow()
+    posts = [
+        Post(
+            id=i,
+            title=f"Post {i}",
+            content="Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 8,
+            created_at=now,
+            updated_at=now,
+            author_id=1,
+        )
+        for i in range(items)
+    ]
+    return {"items": posts, "total": items, "page": 1, "size": items, "pages": 1}
+
+def build_app(page: dict):
+    from fastapi import APIRouter, FastAPI
+
+    from src.core.responses import FastJSONRoute, ORJSONResponse
+    from src.posts import schemas
+
+    default_router = APIRouter()
+    fast_router = APIRouter(route_class=FastJSONRoute, default_response_class=ORJSONResponse)
+
+    @default_router.get("/default", response_model=schemas.PostPage)
+    async def default_page():
+        return page
+
+    @fast_router.get("/fast", response_model=schemas.PostPage)
+    async def fast_page():
+        return page
+
+    app = FastAPI()
+    app.include_router(default_router)
+    app.include_router(fast_router)
+    return app
+
+async def measure(client, path: str, requests: int) -> float:
+    for _ in range(min(50, requests)):
+        await client.get(path)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await client.get(path)
+    return requests / (time.perf_counter() - start)
+
+async def run(items: int, requests: int) -> dict:
+    import httpx
+
+    app = build_app(build_page(items))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        default_body = (await client.get("/default")).json()
+        fast_body = (await client.get("/fast")).json()
+        assert default_body == fast_body, "fast path must produce the same document"
+        default_rps = await measure(client, "/default", requests)
+        fast_rps = await measure(client, "/fast", requests)
+    return {
+        "items": items,
+        "requests": requests,
+        "default_requests_per_second": default_rps,
+        "fast_requests_per_second": fast_rps,
+        "speedup": fast_rps / default_rps,
+    }
+
+def main():
+    args = parse_args()
+    result = asyncio.run(run(args.items, args.requests))
+    for key, value in result.items():
+        print(f"{key:>28}: {value:.2f}" if isinstance(value, float) else f"{key:>28}: {value}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Timing, result files and baseline comparison shared by the benchmark suites"""
+import inspect
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+Operation = Callable[[], Union[Any, Awaitable[Any]]]
+
+@dataclass
+class BenchResult:
+    name: str
+    iterations: int
+    ops_per_second: float
+    mean_ms: float
+    median_ms: float
+    p95_ms: float
+
+def _summarize(name: str, timings: List[float]) -> BenchResult:
+    ordered = sorted(timings)
+    total = sum(ordered)
+    return BenchResult(
+        name=name,
+        iterations=len(ordered),
+        ops_per_second=len(ordered) / total if total else float("inf"),
+        mean_ms=total / len(ordered) * 1000,
+        median_ms=statistics.median(ordered) * 1000,
+        p95_ms=ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+    )
+
+async def measure(
+    name: str,
+    operation: Operation,
+    min_time: float = 0.5,
+    min_iterations: int = 5,
+    max_iterations: int = 100_000,
+    warmup: int = 3,
+) -> BenchResult:
+    """Run ``operation`` until ``min_time`` has elapsed and time each call.
+
+    ``operation`` may be sync or return an awaitable, which is awaited.
+    """
+    for _ in range(warmup):
+        outcome = operation()
+        if inspect.isawaitable(outcome):
+            await outcome
+
+    timings: List[float] = []
+    deadline = time.perf_counter() + min_time
+    while len(timings) < max_iterations and (len(timings) < min_iterations or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        outcome = operation()
+        if inspect.isawaitable(outcome):
+            await outcome
+        timings.append(time.perf_counter() - start)
+    return _summarize(name, timings)
+
+def use_bench_database(tmpdir: str) -> str:
+    """Point the app at BENCH_DATABASE_URL or a file-backed SQLite; call before importing src"""
+    url = os.environ.get("BENCH_DATABASE_URL", f"sqlite:///{os.path.join(tmpdir, 'bench.db')}")
+    os.environ["DATABASE_URL"] = url
+    return url
+
+def bench_tmpdir() -> tempfile.TemporaryDirectory:
+    return tempfile.TemporaryDirectory(prefix="bench-")
+
+def write_results(path: str, results: List[BenchResult], config: Optional[Dict[str, Any]] = None) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    document = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "config": config or {},
+        "results": {result.name: asdict(result) for result in results},
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    with open(path) as f:
+        return json.load(f)["results"]
+
+def compare(
+    results: List[BenchResult],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float,
+) -> List[str]:
+    """Names (with details) of benchmarks whose throughput fell more than ``tolerance`` below baseline"""
+    regressions = []
+    for result in results:
+        reference = baseline.get(result.name)
+        if reference is None:
+            continue
+        floor = reference["ops_per_second"] * (1 - tolerance)
+        if result.ops_per_second < floor:
+            change = result.ops_per_second / reference["ops_per_second"] - 1
+            regressions.append(
+                f"{result.name}: {result.ops_per_second:.1f} ops/s vs baseline "
+                f"{reference['ops_per_second']:.1f} ({change:+.1%})"
+            )
+    return regressions
+
+def print_results(results: List[BenchResult], baseline: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+    print(f"{'benchmark':<40} {'ops/s':>12} {'median ms':>10} {'p95 ms':>10} {'vs base':>9}")
+    for result in results:
+        reference = (baseline or {}).get(result.name)
+        change = f"{result.ops_per_second / reference['ops_per_second'] - 1:+.1%}" if reference else "-"
+        print(
+            f"{result.name:<40} {result.ops_per_second:>12.1f} "
+            f"{result.median_ms:>10.3f} {result.p95_ms:>10.3f} {change:>9}"
+        )
+
+BENCH_PASSWORD = "Bench123!@#"
+SEED_WORDS = ("database", "async", "index", "cache", "query", "latency", "python", "search")
+
+async def seed_database(posts: int) -> Dict[str, Any]:
+    """Create the schema, one user and ``posts`` posts; returns the user's credentials"""
+    from src.auth import schemas as auth_schemas, service as auth_service
+    from src.core.database import AsyncSessionLocal, Base, engine
+    from src.posts import schemas, service
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    async with AsyncSessionLocal() as db:
+        user = await auth_service.create_user(db, auth_schemas.UserCreate(
+            email="bench@example.com", username="bench", password=BENCH_PASSWORD
+        ))
+        batch = [
+            schemas.PostCreate(
+                title=f"Bench post {i} about {SEED_WORDS[i % len(SEED_WORDS)]}",
+                content=" ".join(SEED_WORDS[(i + j) % len(SEED_WORDS)] for j in range(40)),
+            )
+            for i in range(posts)
+        ]
+        if batch:
+            await service.create_posts_bulk(db, batch, user_id=user.id)
+    return {"user_id": user.id, "username": "bench", "password": BENCH_PASSWORD}
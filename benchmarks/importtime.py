@@ -0,0 +1,72 @@
+"""Report what importing the app costs, from ``python -X importtime``.
+
+Runs the import in a fresh interpreter (best of ``--repeat``) and lists
+the slowest modules by cumulative and self time:
+
+    python -m benchmarks.importtime --module src.main --top 20
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="src.main", help="Module to import")
+    parser.add_argument("--top", type=int, default=20, help="Modules to list")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters to sample; the fastest is reported")
+    parser.add_argument("--output", help="Also write the report as JSON to this path")
+    return parser.parse_args()
+
+def sample(module: str) -> List[Dict]:
+    """One ``-X importtime`` run: a row per module with self/cumulative microseconds"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=root, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+        })
+    return rows
+
+def main():
+    args = parse_args()
+    runs = [sample(args.module) for _ in range(args.repeat)]
+    rows = min(runs, key=lambda r: sum(row["self_us"] for row in r))
+    total_us = sum(row["self_us"] for row in rows)
+    # Depth 1: what the target module pulls in directly, with everything beneath it
+    direct = sorted((r for r in rows if r["depth"] == 1), key=lambda r: -r["cumulative_us"])
+    by_self = sorted(rows, key=lambda r: -r["self_us"])
+    report = {
+        "module": args.module,
+        "total_ms": total_us / 1000,
+        "modules_imported": len(rows),
+        "direct_imports": [{**r, "cumulative_ms": r["cumulative_us"] / 1000} for r in direct[:args.top]],
+        "slowest_self": [{**r, "self_ms": r["self_us"] / 1000} for r in by_self[:args.top]],
+    }
+
+    print(f"import {args.module}: {report['total_ms']:.1f}ms across {len(rows)} modules (best of {args.repeat})")
+    print(f"\n{'imported by ' + args.module:<40} {'cumulative ms':>14}")
+    for row in report["direct_imports"]:
+        print(f"{row['module']:<40} {row['cumulative_ms']:>14.1f}")
+    print(f"\n{'module':<50} {'self ms':>8}")
+    for row in report["slowest_self"]:
+        print(f"{row['module']:<50} {row['self_ms']:>8.1f}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""Replay weighted API scenarios at a target concurrency or request rate.
+
+Drives a running server (``--url``) or the in-process ASGI app against a
+seeded throwaway database (``--in-process``) and reports per-endpoint
+latency percentiles, throughput and error rates:
+
+    python -m benchmarks.loadgen --url http://localhost:8000 --concurrency 50 --duration 60
+    python -m benchmarks.loadgen --in-process --rate 200 --duration 30 --output load.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+API = "/api/v1"
+PASSWORD = "Load123!@#"
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="Base URL of a running server")
+    target.add_argument("--in-process", action="store_true", help="Drive the ASGI app in this process")
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--concurrency", type=int, default=10, help="Virtual users looping scenarios (closed loop)")
+    load.add_argument("--rate", type=float, help="Scenario starts per second (open loop)")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="Open loop: scenarios allowed to overlap")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to generate load")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--posts", type=int, default=1000, help="In-process: posts seeded before the run")
+    parser.add_argument(
+        "--scenario", action="append", metavar="NAME=WEIGHT",
+        help=f"Override scenario weights; repeatable (default: {', '.join(f'{s.name}={s.weight}' for s in SCENARIOS)})"
+    )
+    parser.add_argument("--seed", type=int, help="Random seed for scenario selection")
+    parser.add_argument("--output", help="Also write the report as JSON to this path")
+    return parser.parse_args()
+
+@dataclass
+class EndpointStats:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: Dict[int, int] = field(default_factory=lambda: defaultdict(int))
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+class LoadSession:
+    """Shared HTTP client that records every request under its endpoint template"""
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.stats: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+        self.scenario_errors: Dict[str, int] = defaultdict(int)
+        self.dropped = 0
+        self.post_ids: List[int] = []
+        self.accounts: List[Dict[str, str]] = []
+
+    async def request(self, endpoint: str, method: str, url: str, **kwargs) -> httpx.Response:
+        stats = self.stats[endpoint]
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            stats.latencies.append(time.perf_counter() - start)
+            stats.errors += 1
+            stats.statuses[0] += 1
+            raise
+        stats.latencies.append(time.perf_counter() - start)
+        stats.statuses[response.status_code] += 1
+        if response.status_code >= 400:
+            stats.errors += 1
+            response.raise_for_status()
+        return response
+
+    def remember_posts(self, posts: List[dict]) -> None:
+        self.post_ids.extend(post["id"] for post in posts)
+        if len(self.post_ids) > 10_000:
+            del self.post_ids[:-10_000]
+
+    def report(self, elapsed: float) -> dict:
+        endpoints = {}
+        for endpoint, stats in sorted(self.stats.items()):
+            ordered = sorted(stats.latencies)
+            count = len(ordered)
+            endpoints[endpoint] = {
+                "requests": count,
+                "requests_per_second": count / elapsed,
+                "error_rate": stats.errors / count if count else 0.0,
+                "p50_ms": percentile(ordered, 0.50) * 1000,
+                "p95_ms": percentile(ordered, 0.95) * 1000,
+                "p99_ms": percentile(ordered, 0.99) * 1000,
+                "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+                "statuses": {str(code): n for code, n in sorted(stats.statuses.items())},
+            }
+        total = sum(e["requests"] for e in endpoints.values())
+        errors = sum(s.errors for s in self.stats.values())
+        return {
+            "duration_seconds": elapsed,
+            "requests": total,
+            "requests_per_second": total / elapsed,
+            "error_rate": errors / total if total else 0.0,
+            "scenario_errors": dict(self.scenario_errors),
+            "dropped_scenarios": self.dropped,
+            "endpoints": endpoints,
+        }
+
+async def login(session: LoadSession, username: str) -> Dict[str, str]:
+    response = await session.request(
+        "POST /auth/token", "POST", f"{API}/auth/token",
+        data={"username": username, "password": PASSWORD}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+async def onboard(session: LoadSession) -> None:
+    """register -> login -> create posts -> list/paginate -> read"""
+    name = f"load{uuid.uuid4().hex[:12]}"
+    await session.request("POST /auth/register", "POST", f"{API}/auth/register", json={
+        "email": f"{name}@example.com", "username": name, "password": PASSWORD
+    })
+    headers = await login(session, name)
+    session.accounts.append({"username": name, "authorization": headers["Authorization"]})
+    for i in range(3):
+        response = await session.request("POST /posts/", "POST", f"{API}/posts/", headers=headers, json={
+            "title": f"Load test post {i}", "content": f"Written by {name} during a load test"
+        })
+        session.remember_posts([response.json()])
+    page = (await session.request("GET /posts/", "GET", f"{API}/posts/", params={"size": 20})).json()
+    await session.request("GET /posts/?page=2", "GET", f"{API}/posts/", params={"size": 20, "page": 2})
+    if page["items"]:
+        post_id = random.choice(page["items"])["id"]
+        await session.request("GET /posts/{post_id}", "GET", f"{API}/posts/{post_id}")
+
+async def browse(session: LoadSession) -> None:
+    """Anonymous reader: first page, next page by cursor, then a few posts"""
+    first = (await session.request("GET /posts/cursor", "GET", f"{API}/posts/cursor", params={"size": 20})).json()
+    session.remember_posts(first["items"])
+    if first["next_cursor"]:
+        await session.request(
+            "GET /posts/cursor?cursor", "GET", f"{API}/posts/cursor",
+            params={"size": 20, "cursor": first["next_cursor"]}
+        )
+    for _ in range(3):
+        if session.post_ids:
+            post_id = random.choice(session.post_ids)
+            await session.request("GET /posts/{post_id}", "GET", f"{API}/posts/{post_id}")
+
+async def author(session: LoadSession) -> None:
+    """Returning author: writes a post and checks their own feed"""
+    if not session.accounts:
+        await onboard(session)
+        return
+    account = random.choice(session.accounts)
+    headers = {"Authorization": account["authorization"]}
+    response = await session.request("POST /posts/", "POST", f"{API}/posts/", headers=headers, json={
+        "title": "Follow-up post", "content": f"More from {account['username']}"
+    })
+    session.remember_posts([response.json()])
+    await session.request("GET /me/posts", "GET", f"{API}/me/posts", headers=headers, params={"size": 20})
+
+async def search(session: LoadSession) -> None:
+    term = random.choice(("database", "load", "post", "index", "python"))
+    try:
+        await session.request("GET /posts/search", "GET", f"{API}/posts/search", params={"q": term})
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code != 501:  # Search unsupported on this database
+            raise
+
+@dataclass
+class Scenario:
+    name: str
+    weight: float
+    run: Callable[[LoadSession], Awaitable[None]]
+
+SCENARIOS = [
+    Scenario("onboard", 1, onboard),
+    Scenario("browse", 6, browse),
+    Scenario("author", 2, author),
+    Scenario("search", 1, search),
+]
+
+def weighted_scenarios(overrides: Optional[List[str]]) -> List[Scenario]:
+    weights = {scenario.name: scenario.weight for scenario in SCENARIOS}
+    for override in overrides or []:
+        name, _, weight = override.partition("=")
+        if name not in weights:
+            raise SystemExit(f"Unknown scenario {name!r}; choose from {', '.join(weights)}")
+        weights[name] = float(weight)
+    return [Scenario(s.name, weights[s.name], s.run) for s in SCENARIOS if weights[s.name] > 0]
+
+async def run_scenario(session: LoadSession, scenario: Scenario) -> None:
+    try:
+        await scenario.run(session)
+    except (httpx.HTTPError, KeyError, ValueError):
+        session.scenario_errors[scenario.name] += 1
+
+async def closed_loop(session: LoadSession, scenarios: List[Scenario], concurrency: int, deadline: float) -> None:
+    weights = [s.weight for s in scenarios]
+
+    async def user():
+        while time.perf_counter() < deadline:
+            await run_scenario(session, random.choices(scenarios, weights)[0])
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+
+async def open_loop(
+    session: LoadSession,
+    scenarios: List[Scenario],
+    rate: float,
+    max_in_flight: int,
+    deadline: float
+) -> None:
+    """Start scenarios on a fixed schedule, independent of response times"""
+    weights = [s.weight for s in scenarios]
+    in_flight = set()
+    start = time.perf_counter()
+    for n in itertools.count():
+        due = start + n / rate
+        if due >= deadline:
+            break
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+        if len(in_flight) >= max_in_flight:
+            session.dropped += 1
+            continue
+        task = asyncio.create_task(run_scenario(session, random.choices(scenarios, weights)[0]))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+    if in_flight:
+        await asyncio.gather(*in_flight)
+
+async def run(args) -> dict:
+    scenarios = weighted_scenarios(args.scenario)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    if args.in_process:
+        from src.main import app
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://loadgen", timeout=args.timeout
+        )
+    else:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits)
+
+    async with client:
+        session = LoadSession(client)
+        start = time.perf_counter()
+        deadline = start + args.duration
+        if args.rate:
+            await open_loop(session, scenarios, args.rate, args.max_in_flight, deadline)
+        else:
+            await closed_loop(session, scenarios, args.concurrency, deadline)
+        report = session.report(time.perf_counter() - start)
+
+    report["config"] = {
+        "target": "in-process" if args.in_process else args.url,
+        "mode": "rate" if args.rate else "concurrency",
+        "rate": args.rate,
+        "concurrency": None if args.rate else args.concurrency,
+        "scenarios": {s.name: s.weight for s in scenarios},
+    }
+    return report
+
+def print_report(report: dict) -> None:
+    print(
+        f"{report['requests']} requests in {report['duration_seconds']:.1f}s: "
+        f"{report['requests_per_second']:.1f} req/s, {report['error_rate']:.2%} errors"
+    )
+    if report["dropped_scenarios"]:
+        print(f"{report['dropped_scenarios']} scenarios dropped at --max-in-flight")
+    if report["scenario_errors"]:
+        print("Failed scenarios: " + ", ".join(f"{k}={v}" for k, v in report["scenario_errors"].items()))
+    print(f"\n{'endpoint':<28} {'reqs':>7} {'req/s':>8} {'err%':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for endpoint, stats in report["endpoints"].items():
+        print(
+            f"{endpoint:<28} {stats['requests']:>7} {stats['requests_per_second']:>8.1f} "
+            f"{stats['error_rate'] * 100:>6.2f} {stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}"
+        )
+
+def main():
+    args = parse_args()
+    if args.seed is not None:
+        random.seed(args.seed)
+    if args.in_process:
+        from benchmarks.harness import bench_tmpdir, seed_database, use_bench_database
+
+        with bench_tmpdir() as tmpdir:
+            use_bench_database(tmpdir)
+            report = asyncio.run(_seed_and_run(args, seed_database))
+    else:
+        report = asyncio.run(run(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+async def _seed_and_run(args, seed_database) -> dict:
+    await seed_database(args.posts)
+    try:
+        return await run(args)
+    finally:
+        from src.core.database import async_engine
+        await async_engine.dispose()
+
+if __name__ == "__main__":
+    main()
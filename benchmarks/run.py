@@ -0,0 +1,78 @@
+"""Run the benchmark suites, write JSON results and check them against a baseline.
+
+Seeds a throwaway file-backed SQLite database (or BENCH_DATABASE_URL) and
+exits non-zero when any benchmark's throughput falls more than
+``--tolerance`` below the stored baseline:
+
+    python -m benchmarks.run --posts 2000
+    python -m benchmarks.run --suite micro --update-baseline
+"""
+import argparse
+import asyncio
+import importlib
+import os
+import sys
+
+from benchmarks.harness import (
+    bench_tmpdir,
+    compare,
+    load_results,
+    print_results,
+    seed_database,
+    use_bench_database,
+    write_results,
+)
+
+SUITES = {"micro": "benchmarks.bench_micro", "e2e": "benchmarks.bench_e2e"}
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES), help="Suite to run; repeatable (default: all)")
+    parser.add_argument("--posts", type=int, default=1000, help="Posts seeded before benchmarking")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds spent timing each benchmark")
+    parser.add_argument("--output", default=os.path.join(HERE, "results", "latest.json"))
+    parser.add_argument("--baseline", default=os.path.join(HERE, "baseline.json"))
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed throughput drop, as a fraction")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    return parser.parse_args()
+
+async def run(suites, posts: int, min_time: float):
+    seeded = await seed_database(posts)
+    results = []
+    for suite in suites:
+        module = importlib.import_module(SUITES[suite])
+        results.extend(await module.run(seeded, min_time))
+
+    from src.core.database import async_engine
+    await async_engine.dispose()
+    return results
+
+def main() -> int:
+    args = parse_args()
+    suites = args.suite or list(SUITES)
+    config = {"suites": suites, "posts": args.posts, "min_time": args.min_time}
+    with bench_tmpdir() as tmpdir:
+        config["database"] = use_bench_database(tmpdir).split(":", 1)[0]
+        results = asyncio.run(run(suites, args.posts, args.min_time))
+
+    write_results(args.output, results, config)
+    if args.update_baseline:
+        write_results(args.baseline, results, config)
+        print_results(results)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    baseline = load_results(args.baseline) if os.path.exists(args.baseline) else {}
+    print_results(results, baseline)
+    print(f"\nResults written to {args.output}")
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\nThroughput regressed by more than {args.tolerance:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
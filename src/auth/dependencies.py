@@ -1,32 +1,49 @@
+import time
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from jose import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.config import settings
-from src.core.database import get_db
+from src.core.database import get_async_db
+from src.core.security import decode_access_token
 from . import schemas, service
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/token")
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
+    # Principals are looked up on the primary: a freshly registered user has
+    # no token to be marked sticky with, so a lagging replica could 401 them
+    if settings.AUTH_PRINCIPAL_CACHE_ENABLED:
+        principal = service.principal_cache.get(token)
+        if principal is not None:
+            return principal
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = decode_access_token(token)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
         token_data = schemas.TokenData(username=username)
     except JWTError:
         raise credentials_exception
-    user = service.get_user_by_username(db, username=token_data.username)
+    user = await service.get_user_by_username(db, username=token_data.username)
     if user is None:
         raise credentials_exception
-    return user 
\ No newline at end of file
+
+    principal = schemas.User.model_validate(user)
+    if settings.AUTH_PRINCIPAL_CACHE_ENABLED:
+        # Never serve a cached principal past the token's own expiry
+        ttl = settings.AUTH_PRINCIPAL_CACHE_TTL
+        if payload.get("exp") is not None:
+            ttl = min(ttl, payload["exp"] - time.time())
+        service.principal_cache.set(token, principal, ttl=ttl)
+    return principal
@@ -1,4 +1,5 @@
 from fastapi import HTTPException, status
+from .constants import EMAIL_EXISTS_MSG
 
 class AuthenticationError(HTTPException):
     def __init__(self, detail: str = "Could not validate credentials"):
@@ -13,4 +14,11 @@ class UserNotFoundError(HTTPException):
         super().__init__(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=detail,
-        ) 
\ No newline at end of file
+        )
+
+class UserAlreadyExistsError(HTTPException):
+    def __init__(self, detail: str = EMAIL_EXISTS_MSG):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail,
+        )
@@ -1,27 +1,88 @@
-from sqlalchemy.orm import Session
+from typing import Optional
+
+from sqlalchemy import event, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from . import models, schemas
-from src.core.security import get_password_hash, verify_password
+from .constants import EMAIL_EXISTS_MSG, USERNAME_EXISTS_MSG
+from .exceptions import UserAlreadyExistsError
+from src.core.cache import LRUCache
+from src.core.config import settings
+from src.core.security import get_password_hash, needs_rehash, verify_password
+
+# Resolved principals keyed by access token, see dependencies.get_current_user
+principal_cache = LRUCache(
+    maxsize=settings.AUTH_PRINCIPAL_CACHE_SIZE,
+    ttl=settings.AUTH_PRINCIPAL_CACHE_TTL
+)
+
+def invalidate_principal(user_id: int) -> None:
+    principal_cache.delete_where(lambda principal: principal.id == user_id)
+
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target):
+    invalidate_principal(target.id)
+
+async def get_user_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(models.User).where(models.User.email == email))
+    return result.scalars().first()
 
-def get_user_by_email(db: Session, email: str):
-    return db.query(models.User).filter(models.User.email == email).first()
+async def get_user_by_username(db: AsyncSession, username: str):
+    result = await db.execute(select(models.User).where(models.User.username == username))
+    return result.scalars().first()
 
-def get_user_by_username(db: Session, username: str):
-    return db.query(models.User).filter(models.User.username == username).first()
+# Unique columns on users and the error a duplicate value maps to
+UNIQUE_CONFLICTS = {"email": EMAIL_EXISTS_MSG, "username": USERNAME_EXISTS_MSG}
 
-def create_user(db: Session, user: schemas.UserCreate):
-    hashed_password = get_password_hash(user.password)
-    db_user = models.User(
+def _conflicting_column(error: IntegrityError) -> Optional[str]:
+    """Which unique column an IntegrityError from inserting a user violated.
+
+    asyncpg and psycopg2 report the index name (``ix_users_email``);
+    SQLite only puts ``users.email`` in the message.
+    """
+    orig = error.orig
+    constraint = None
+    for source in (orig, getattr(orig, "__cause__", None), getattr(orig, "diag", None)):
+        constraint = constraint or getattr(source, "constraint_name", None)
+    for column in UNIQUE_CONFLICTS:
+        if constraint == f"ix_users_{column}" or (constraint is None and f"users.{column}" in str(orig)):
+            return column
+    return None
+
+async def create_user(db: AsyncSession, user: schemas.UserCreate):
+    """Insert a user in one ``INSERT ... RETURNING`` round trip.
+
+    Duplicates are caught by the unique indexes rather than looked up first,
+    which also closes the race between a lookup and the insert.
+    """
+    hashed_password = await get_password_hash(user.password)
+    statement = insert(models.User).values(
         email=user.email,
         username=user.username,
         hashed_password=hashed_password
-    )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    ).returning(models.User)
+    try:
+        db_user = (await db.execute(statement)).scalar_one()
+        await db.commit()
+    except IntegrityError as error:
+        await db.rollback()
+        column = _conflicting_column(error)
+        if column is None:
+            raise
+        raise UserAlreadyExistsError(UNIQUE_CONFLICTS[column]) from error
     return db_user
 
-def authenticate_user(db: Session, username: str, password: str):
-    user = get_user_by_username(db, username)
-    if not user or not verify_password(password, user.hashed_password):
+async def authenticate_user(db: AsyncSession, username: str, password: str):
+    user = await get_user_by_username(db, username)
+    if not user or not await verify_password(password, user.hashed_password):
         return False
-    return user 
\ No newline at end of file
+    if needs_rehash(user.hashed_password):
+        # The plain password is only available here, so move it to the current cost now
+        user.hashed_password = await get_password_hash(password)
+        await db.commit()
+    return user
+
+async def prime_statement_cache(db: AsyncSession) -> None:
+    """Compile the login lookup before traffic arrives"""
+    await get_user_by_username(db, "")
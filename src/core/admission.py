@@ -0,0 +1,177 @@
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Optional, Sequence
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .config import AdmissionClass
+from .metrics import ADMISSION_ACTIVE, ADMISSION_QUEUE_DEPTH, ADMISSION_REJECTED, ADMISSION_WAIT
+
+BUSY_DETAIL = "Server is busy, please retry shortly"
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+class AdmissionLimiter:
+    """Concurrency limit with a bounded FIFO wait queue and a wait deadline.
+
+    Slots are handed directly from a finishing request to the oldest
+    waiter. Requests that find the queue full, or wait longer than
+    ``queue_timeout``, are rejected rather than left to pile up. Runs on
+    a single event loop, so no locking is needed.
+    """
+
+    def __init__(self, name: str, limit: int, queue_size: int, queue_timeout: float):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.admitted = 0
+        self.rejected = {"queue_full": 0, "timeout": 0}
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._active_gauge = ADMISSION_ACTIVE.labels(name)
+        self._queue_gauge = ADMISSION_QUEUE_DEPTH.labels(name)
+        self._wait_histogram = ADMISSION_WAIT.labels(name)
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _update_gauges(self) -> None:
+        self._active_gauge.set(self.active)
+        self._queue_gauge.set(len(self._waiters))
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        self.rejected[reason] += 1
+        ADMISSION_REJECTED.labels(self.name, reason).inc()
+        return AdmissionRejected(reason)
+
+    def _expire(self, waiter: asyncio.Future) -> None:
+        if not waiter.done():
+            self._waiters.remove(waiter)
+            waiter.set_exception(self._reject("timeout"))
+            self._update_gauges()
+
+    async def acquire(self) -> None:
+        """Take a slot, waiting in line if needed; raises AdmissionRejected when shedding"""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            self._update_gauges()
+            return
+        if len(self._waiters) >= self.queue_size:
+            raise self._reject("queue_full")
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        timer = loop.call_later(self.queue_timeout, self._expire, waiter)
+        self._waiters.append(waiter)
+        self._update_gauges()
+        start = time.perf_counter()
+        try:
+            await waiter
+        except AdmissionRejected:
+            raise
+        except BaseException:
+            # Cancelled while queued (e.g. the client went away)
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                self.admitted += 1
+                self.release()  # The slot was handed over just before cancellation
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+                self._update_gauges()
+            raise
+        finally:
+            timer.cancel()
+            self._wait_histogram.observe(time.perf_counter() - start)
+        self.admitted += 1
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)  # Hand the slot straight over
+                self._update_gauges()
+                return
+        self.active -= 1
+        self._update_gauges()
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "queue_size": self.queue_size,
+            "queue_timeout": self.queue_timeout,
+            "active": self.active,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+        }
+
+def path_matches(path: str, prefixes: Sequence[str]) -> bool:
+    """Whether ``path`` is one of ``prefixes`` or lies below one, segment by segment.
+
+    ``/health`` matches ``/health`` and ``/health/ready`` but not ``/healthz``;
+    a prefix ending in ``/`` matches everything under it.
+    """
+    for prefix in prefixes:
+        if prefix.endswith("/"):
+            if path.startswith(prefix):
+                return True
+        elif path == prefix or path.startswith(prefix + "/"):
+            return True
+    return False
+
+class AdmissionController:
+    """Maps request paths to admission classes; the first matching class wins"""
+
+    def __init__(self, classes: Sequence[AdmissionClass], exempt_paths: Sequence[str] = ()):
+        self.exempt_paths = tuple(exempt_paths)
+        self.classes = [
+            (tuple(c.paths), AdmissionLimiter(c.name, c.limit, c.queue_size, c.queue_timeout))
+            for c in classes
+        ]
+
+    def classify(self, path: str) -> Optional[AdmissionLimiter]:
+        if path_matches(path, self.exempt_paths):
+            return None
+        for prefixes, limiter in self.classes:
+            if not prefixes or path_matches(path, prefixes):
+                return limiter
+        return None
+
+    def stats(self) -> dict:
+        return {limiter.name: limiter.stats() for _, limiter in self.classes}
+
+class AdmissionControlMiddleware:
+    """Pure ASGI middleware that fails fast with 503 + Retry-After when over capacity"""
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController, retry_after: int = 1):
+        self.app = app
+        self.controller = controller
+        self.retry_after = retry_after
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limiter = self.controller.classify(scope["path"]) if scope["type"] == "http" else None
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await limiter.acquire()
+        except AdmissionRejected:
+            response = JSONResponse(
+                {"detail": BUSY_DETAIL},
+                status_code=503,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
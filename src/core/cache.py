@@ -0,0 +1,235 @@
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+class LRUCache:
+    """Thread-safe in-process LRU cache whose entries also expire after a TTL.
+
+    Memory is bounded by ``maxsize`` entries; the least recently used entry
+    is evicted first. ``ttl`` is the default lifetime in seconds and can be
+    shortened per entry.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        if ttl is not None and ttl <= 0:
+            return
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[Any], bool]) -> int:
+        """Drop every entry whose value matches ``predicate``; returns the count"""
+        with self._lock:
+            keys = [key for key, (value, _) in self._data.items() if predicate(value)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+class CacheBackend(ABC):
+    """Async string cache shared by the read-through paths in the services.
+
+    Subclasses implement the ``_get``/``_set``/``_delete``/``_clear``
+    primitives; hit and miss counters are kept here for every backend.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self._get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        await self._set(key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        await self._delete(key)
+
+    async def clear(self) -> None:
+        await self._clear()
+
+    async def close(self) -> None:
+        """Release connections held by the backend"""
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    @abstractmethod
+    async def _get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    async def _set(self, key: str, value: str, ttl: Optional[float]) -> None:
+        ...
+
+    @abstractmethod
+    async def _delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    async def _clear(self) -> None:
+        ...
+
+class NullCacheBackend(CacheBackend):
+    """Caching disabled: every lookup misses"""
+
+    name = "none"
+
+    async def _get(self, key):
+        return None
+
+    async def _set(self, key, value, ttl):
+        pass
+
+    async def _delete(self, key):
+        pass
+
+    async def _clear(self):
+        pass
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process LRU+TTL backend"""
+
+    name = "memory"
+
+    def __init__(self, maxsize: int = 10000):
+        super().__init__()
+        self._cache = LRUCache(maxsize=maxsize)
+
+    async def _get(self, key):
+        return self._cache.get(key)
+
+    async def _set(self, key, value, ttl):
+        self._cache.set(key, value, ttl=ttl)
+
+    async def _delete(self, key):
+        self._cache.delete(key)
+
+    async def _clear(self):
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        data = super().stats()
+        data["entries"] = len(self._cache)
+        return data
+
+class RedisCacheBackend(CacheBackend):
+    """Backend for any Redis-protocol server, shared across workers.
+
+    Requires the optional ``redis`` package. Server errors are logged and
+    treated as misses so an unavailable cache never fails a request.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str = "cache:"):
+        super().__init__()
+        try:
+            import redis.asyncio as aioredis
+        except ImportError as exc:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package") from exc
+        self.prefix = prefix
+        self._client = aioredis.from_url(url, decode_responses=True)
+
+    async def _get(self, key):
+        try:
+            return await self._client.get(self.prefix + key)
+        except Exception:
+            self.errors += 1
+            logger.warning("Cache get failed for %s", key, exc_info=True)
+            return None
+
+    async def _set(self, key, value, ttl):
+        try:
+            await self._client.set(self.prefix + key, value, ex=int(ttl) if ttl else None)
+        except Exception:
+            self.errors += 1
+            logger.warning("Cache set failed for %s", key, exc_info=True)
+
+    async def _delete(self, key):
+        try:
+            await self._client.delete(self.prefix + key)
+        except Exception:
+            self.errors += 1
+            logger.warning("Cache delete failed for %s", key, exc_info=True)
+
+    async def _clear(self):
+        try:
+            async for key in self._client.scan_iter(match=self.prefix + "*"):
+                await self._client.delete(key)
+        except Exception:
+            self.errors += 1
+            logger.warning("Cache clear failed", exc_info=True)
+
+    async def close(self):
+        await self._client.aclose()
+
+def create_cache_backend(backend: str, url: Optional[str] = None, maxsize: int = 10000) -> CacheBackend:
+    if backend == "redis":
+        if not url:
+            raise RuntimeError("CACHE_BACKEND=redis requires CACHE_URL")
+        return RedisCacheBackend(url)
+    if backend == "none":
+        return NullCacheBackend()
+    return MemoryCacheBackend(maxsize=maxsize)
+
+cache = create_cache_backend(
+    settings.CACHE_BACKEND,
+    url=settings.CACHE_URL,
+    maxsize=settings.CACHE_MAX_ENTRIES
+)
@@ -0,0 +1,262 @@
+import gzip
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .cache import LRUCache
+from .metrics import COMPRESSION_CACHE, COMPRESSION_INPUT_BYTES, COMPRESSION_OUTPUT_BYTES, COMPRESSION_SECONDS
+
+# Media types worth compressing; images, archives etc. are already compressed
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+# Statuses whose body (or lack of one) must go out untouched
+SKIP_STATUSES = (204, 206, 304)
+
+class StreamCompressor:
+    """Incremental compressor; each chunk's output is flushed so clients can decode it right away"""
+
+    def __init__(self, compress: Callable[[bytes], bytes], flush: Callable[[], bytes], finish: Callable[[], bytes]):
+        self._compress = compress
+        self._flush = flush
+        self._finish = finish
+
+    def write(self, chunk: bytes) -> bytes:
+        return self._compress(chunk) + self._flush()
+
+    def close(self) -> bytes:
+        return self._finish()
+
+@dataclass(frozen=True)
+class Encoder:
+    name: str
+    compress: Callable[[bytes], bytes]
+    stream: Callable[[], StreamCompressor]
+
+def gzip_encoder(level: int = 6) -> Encoder:
+    def stream() -> StreamCompressor:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+        return StreamCompressor(compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush)
+
+    return Encoder("gzip", lambda body: gzip.compress(body, compresslevel=level, mtime=0), stream)
+
+def brotli_encoder(quality: int = 4) -> Optional[Encoder]:
+    """Brotli via the optional ``brotli`` package; None when it isn't installed"""
+    try:
+        import brotli
+    except ImportError:
+        return None
+
+    def stream() -> StreamCompressor:
+        compressor = brotli.Compressor(quality=quality)
+        return StreamCompressor(compressor.process, compressor.flush, compressor.finish)
+
+    return Encoder("br", lambda body: brotli.compress(body, quality=quality), stream)
+
+def zstd_encoder(level: int = 3) -> Optional[Encoder]:
+    """Zstandard via the optional ``zstandard`` package; None when it isn't installed"""
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    compressor = zstandard.ZstdCompressor(level=level)
+
+    def stream() -> StreamCompressor:
+        compressobj = zstandard.ZstdCompressor(level=level).compressobj()
+        return StreamCompressor(
+            compressobj.compress,
+            lambda: compressobj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+            compressobj.flush
+        )
+
+    return Encoder("zstd", compressor.compress, stream)
+
+def build_encoders(
+    names: Sequence[str],
+    gzip_level: int = 6,
+    brotli_quality: int = 4,
+    zstd_level: int = 3,
+) -> Dict[str, Encoder]:
+    """Encoders for ``names`` in server preference order, skipping those whose library is missing"""
+    factories = {
+        "gzip": lambda: gzip_encoder(gzip_level),
+        "br": lambda: brotli_encoder(brotli_quality),
+        "zstd": lambda: zstd_encoder(zstd_level),
+    }
+    encoders = {}
+    for name in names:
+        if name not in factories:
+            raise ValueError(f"Unknown compression encoding {name!r}; expected one of {sorted(factories)}")
+        encoder = factories[name]()
+        if encoder is not None:
+            encoders[name] = encoder
+    return encoders
+
+def negotiate_encoding(accept_encoding: str, available: Sequence[str]) -> Optional[str]:
+    """Pick from ``available`` by the client's q-values; ties go to the earlier (server-preferred) name"""
+    accepted: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    wildcard = accepted.get("*", 0.0)
+
+    best, best_quality = None, 0.0
+    for name in available:
+        quality = accepted.get(name, wildcard)
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+def is_compressible(status_code: int, headers: Headers) -> bool:
+    return (
+        status_code >= 200
+        and status_code not in SKIP_STATUSES
+        and "content-encoding" not in headers
+        and "content-range" not in headers
+        and "no-transform" not in headers.get("cache-control", "")
+        and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+    )
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing responses for clients that accept it.
+
+    Whole bodies below ``minimum_size`` go out as they are, as do bodies
+    that would not shrink. Streamed bodies are compressed chunk by chunk.
+    With a ``cache``, compressed bodies of responses that carry an ETag
+    are kept by (encoding, URL, ETag), so hot pages are compressed once
+    per version rather than on every hit.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encoders: Dict[str, Encoder],
+        minimum_size: int = 1024,
+        cache: Optional[LRUCache] = None,
+    ):
+        self.app = app
+        self.encoders = encoders
+        self.minimum_size = minimum_size
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoding = None
+        if scope["type"] == "http" and self.encoders:
+            encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), list(self.encoders))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        encoder = self.encoders[encoding]
+        start_message: Optional[Message] = None
+        streamer: Optional[StreamCompressor] = None
+        passthrough = False
+        stream_stats = [0, 0, 0.0]  # Bytes in, bytes out, CPU seconds
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, streamer, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                if is_compressible(message["status"], Headers(raw=message["headers"])):
+                    start_message = message  # Held until the first body chunk shows its size
+                else:
+                    passthrough = True
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                passthrough = True
+                if start_message is not None:
+                    await send(start_message)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if streamer is None and not more_body:
+                await self._send_whole(scope, send, start_message, body, encoding, encoder)
+                return
+
+            if streamer is None:
+                streamer = encoder.stream()
+                _mark_encoded(start_message, encoding)
+                await send(start_message)
+            cpu_start = time.thread_time()
+            chunk = streamer.write(body)
+            if not more_body:
+                chunk += streamer.close()
+            stream_stats[0] += len(body)
+            stream_stats[1] += len(chunk)
+            stream_stats[2] += time.thread_time() - cpu_start
+            if not more_body:
+                _record(encoding, *stream_stats)
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _send_whole(
+        self, scope: Scope, send: Send, start_message: Message, body: bytes, encoding: str, encoder: Encoder
+    ) -> None:
+        if len(body) < self.minimum_size:
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        etag = Headers(raw=start_message["headers"]).get("etag")
+        key = (encoding, scope["path"], scope.get("query_string", b""), etag) if self.cache is not None and etag else None
+        compressed = self.cache.get(key) if key is not None else None
+        if key is not None:
+            COMPRESSION_CACHE.labels("hit" if compressed is not None else "miss").inc()
+        cpu_seconds = 0.0
+        if compressed is None:
+            cpu_start = time.thread_time()
+            compressed = encoder.compress(body)
+            cpu_seconds = time.thread_time() - cpu_start
+            if key is not None:
+                self.cache.set(key, compressed)
+
+        if len(compressed) >= len(body):
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+            return
+        _record(encoding, len(body), len(compressed), cpu_seconds)
+        _mark_encoded(start_message, encoding, content_length=len(compressed))
+        await send(start_message)
+        await send({"type": "http.response.body", "body": compressed})
+
+def _mark_encoded(start_message: Message, encoding: str, content_length: Optional[int] = None) -> None:
+    headers = MutableHeaders(scope=start_message)
+    headers["Content-Encoding"] = encoding
+    headers.add_vary_header("Accept-Encoding")
+    if content_length is None:
+        del headers["Content-Length"]
+    else:
+        headers["Content-Length"] = str(content_length)
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        # The encoded bytes differ, so a strong validator no longer holds
+        headers["ETag"] = f"W/{etag}"
+
+def _record(encoding: str, input_bytes: int, output_bytes: int, cpu_seconds: float) -> None:
+    COMPRESSION_INPUT_BYTES.labels(encoding).inc(input_bytes)
+    COMPRESSION_OUTPUT_BYTES.labels(encoding).inc(output_bytes)
+    if cpu_seconds:
+        COMPRESSION_SECONDS.labels(encoding).observe(cpu_seconds)
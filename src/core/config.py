@@ -1,7 +1,16 @@
 from functools import lru_cache
-from typing import List
-from pydantic import field_validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
+import json
+from typing import Annotated, List, Literal, Optional
+from pydantic import BaseModel, Field, ValidationInfo, field_validator, model_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
+
+class AdmissionClass(BaseModel):
+    """A concurrency limit shared by every request whose path starts with one of ``paths``"""
+    name: str
+    paths: List[str] = []  # Whole-segment path prefixes; an empty list matches everything
+    limit: int  # Requests served at once
+    queue_size: int  # Requests allowed to wait for a slot
+    queue_timeout: float  # Seconds a request may wait before it is shed
 
 class Settings(BaseSettings):
     DEBUG: bool = False
@@ -12,11 +21,87 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///:memory:"  # Default for testing
     DATABASE_TEST_URL: str = "sqlite:///:memory:"
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30  # Seconds to wait for a connection before erroring
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced; -1 disables
+    DB_POOL_PRE_PING: bool = True
+    DB_MAX_CONNECTIONS: Optional[int] = None  # Budget across all server workers; src.serve splits it per worker
+    DB_POOL_WARMUP: int = 4  # Connections opened per engine at startup, capped at DB_POOL_SIZE
+    DB_REPEATED_QUERY_THRESHOLD: int = 5  # Debug mode logs a likely N+1 at this many repeats; 0 disables
+
+    # Read replicas (comma separated); reads fall back to the primary when empty
+    DATABASE_REPLICA_URLS: Annotated[List[str], NoDecode] = []
+    DATABASE_REPLICA_STRATEGY: Literal["round_robin", "least_loaded"] = "round_robin"
+    DATABASE_REPLICA_STICKY_SECONDS: float = 5  # Reads stay on the primary this long after a write
     
     # Security
     SECRET_KEY: str = "test-secret-key"  # Default for testing
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    JWT_LEEWAY: int = 0  # Seconds of clock skew tolerated when checking token expiry
+
+    # Authenticated principal cache
+    AUTH_PRINCIPAL_CACHE_ENABLED: bool = True
+    AUTH_PRINCIPAL_CACHE_SIZE: int = 10000
+    AUTH_PRINCIPAL_CACHE_TTL: int = 60  # Seconds; never outlives the token itself
+
+    # Password hashing (bcrypt cost and the executor that runs it)
+    PASSWORD_BCRYPT_ROUNDS: int = 12  # Cost for new hashes; logins rehash stored passwords to match
+    PASSWORD_BCRYPT_CALIBRATE: bool = False  # Pick the cost at startup from PASSWORD_HASH_TARGET_MS instead
+    PASSWORD_HASH_TARGET_MS: float = 250  # Calibration budget for one hash on this hardware
+    PASSWORD_BCRYPT_MIN_ROUNDS: int = 10  # Calibration never goes below this
+    PASSWORD_BCRYPT_MAX_ROUNDS: int = 16  # ...or above this
+    PASSWORD_HASHER_MODE: Literal["thread", "process"] = "thread"
+    PASSWORD_HASHER_WORKERS: Optional[int] = None  # Defaults to the CPU count
+    PASSWORD_HASHER_QUEUE_DEPTH: int = 32  # Jobs allowed to wait before returning 503
+    PASSWORD_HASHER_RETRY_AFTER: int = 1  # Seconds advertised in Retry-After
+
+    # Cache
+    CACHE_BACKEND: Literal["memory", "redis", "none"] = "memory"
+    CACHE_URL: Optional[str] = None  # e.g. redis://localhost:6379/0 for the redis backend
+    CACHE_MAX_ENTRIES: int = 10000  # Bound for the in-process backend
+
+    # Server (src.serve)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: Optional[int] = None  # Defaults to the CPUs available to the process
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEPALIVE_TIMEOUT: int = 5  # Seconds an idle keep-alive connection stays open
+    SERVER_MAX_REQUESTS: int = 10000  # Requests before a worker is recycled; 0 disables
+    SERVER_MAX_REQUESTS_JITTER: int = 1000  # Random extra requests so workers don't recycle together
+    SERVER_GRACEFUL_TIMEOUT: int = 30  # Seconds in-flight requests get to finish on shutdown
+
+    # Admission control: first matching class wins, so list specific classes before catch-alls
+    ADMISSION_ENABLED: bool = True
+    # Unset: a small class for the bcrypt-bound auth routes under API_V1_STR, then a default class
+    ADMISSION_CLASSES: Optional[List[AdmissionClass]] = Field(None, validate_default=True)
+    # Never queued or shed; matched per path segment. Unset: /health and METRICS_PATH
+    ADMISSION_EXEMPT_PATHS: Optional[List[str]] = None
+    ADMISSION_RETRY_AFTER: int = 1  # Seconds advertised in Retry-After when shedding
+
+    # Startup
+    WARMUP_ENABLED: bool = True  # Pre-connect, build OpenAPI and prime statement caches before /health/ready passes
+
+    # Response compression
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_ENCODINGS: List[str] = ["zstd", "br", "gzip"]  # Server preference; br/zstd need the brotli/zstandard packages
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # Bytes; smaller bodies are sent as they are
+    COMPRESSION_GZIP_LEVEL: int = 6  # 1-9
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 0-11
+    COMPRESSION_ZSTD_LEVEL: int = 3  # 1-22
+    COMPRESSION_CACHE_SIZE: int = 256  # Compressed bodies kept by ETag; 0 disables the cache
+
+    # Metrics
+    METRICS_ENABLED: bool = True
+    METRICS_PATH: str = "/metrics"
+
+    # Posts
+    POSTS_COUNT_CACHE_TTL: int = 30  # Seconds a cached/estimated posts total stays fresh
+    POSTS_CACHE_TTL: int = 300  # Seconds a single post stays in the read-through cache
+    POSTS_BULK_MAX_ITEMS: int = 5000  # Largest batch accepted by POST /posts/bulk
+    POSTS_BULK_CHUNK_SIZE: int = 500  # Rows per multi-row INSERT statement
+    POSTS_EXPORT_BATCH_SIZE: int = 1000  # Rows fetched per server-side cursor batch
     
     # CORS
     ALLOWED_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8000"]
@@ -28,6 +113,39 @@ class Settings(BaseSettings):
             return [origin.strip() for origin in v.split(",")]
         return v
 
+    @field_validator("ADMISSION_CLASSES")
+    @classmethod
+    def default_admission_classes(cls, v, info: ValidationInfo):
+        if v is not None:
+            return v
+        api = info.data.get("API_V1_STR", "/api/v1")
+        return [
+            AdmissionClass(
+                name="auth",
+                paths=[f"{api}/auth/token", f"{api}/auth/register"],
+                limit=8,
+                queue_size=16,
+                queue_timeout=2.0,
+            ),
+            AdmissionClass(name="default", limit=64, queue_size=256, queue_timeout=5.0),
+        ]
+
+    @model_validator(mode="after")
+    def default_admission_exempt_paths(self):
+        # METRICS_PATH is declared after the admission settings, so this runs on the whole model
+        if self.ADMISSION_EXEMPT_PATHS is None:
+            self.ADMISSION_EXEMPT_PATHS = ["/health", self.METRICS_PATH]
+        return self
+
+    @field_validator("DATABASE_REPLICA_URLS", mode="before")
+    @classmethod
+    def parse_replica_urls(cls, v):
+        if isinstance(v, str):
+            if v.strip().startswith("["):
+                return json.loads(v)
+            return [url.strip() for url in v.split(",") if url.strip()]
+        return v
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -1,12 +1,135 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase
+import itertools
+from typing import List, Optional
+
+from fastapi import Depends, Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Session
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 
+from .cache import LRUCache
 from .config import settings
+from .pool import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool, instrument_engine
+
+# asyncio drivers used for each backend on the async path
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+# Session.info key holding the client identity used for read-your-writes
+STICKY_KEY = "sticky_key"
+
+def get_async_database_url(database_url: str) -> str:
+    """Swap the sync driver in a database URL for its asyncio counterpart"""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    driver = ASYNC_DRIVERS.get(backend)
+    if driver is None or url.get_driver_name() == driver:
+        return database_url
+    return url.set(drivername=f"{backend}+{driver}").render_as_string(hide_password=False)
+
+def get_engine_options(database_url: str, is_async: bool = False) -> dict:
+    """Pool configuration from settings for an engine on ``database_url``"""
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory SQLite keeps a single shared connection; there is no queue to size
+        return options
+    options.update(
+        poolclass=InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return options
+
+def create_async_engine_from_url(database_url: str) -> AsyncEngine:
+    async_url = get_async_database_url(database_url)
+    return create_async_engine(async_url, **get_engine_options(async_url, is_async=True))
+
+class PrimarySession(Session):
+    """Session class for the primary; commits mark the client as a recent writer"""
+
+class ReplicaRouter:
+    """Picks a read replica per session, round-robin or least checked-out.
+
+    Clients that committed on the primary within ``sticky_seconds`` keep
+    reading from the primary so they see their own writes. Writers are
+    keyed by their Authorization header and remembered per process, so a
+    follow-up read served by another server worker, or sent with a
+    different token, may still see a lagging replica.
+    """
+
+    def __init__(self, database_urls: List[str], strategy: str = "round_robin", sticky_seconds: float = 5):
+        self.strategy = strategy
+        self.sticky_seconds = sticky_seconds
+        self.engines = [create_async_engine_from_url(url) for url in database_urls]
+        self.sessionmakers = [
+            async_sessionmaker(bind=replica, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+            for replica in self.engines
+        ]
+        self._order = itertools.cycle(range(len(self.engines)))
+        self._recent_writers = LRUCache(maxsize=100000, ttl=sticky_seconds)
+
+    def mark_write(self, key: Optional[str]) -> None:
+        if key and self.sticky_seconds > 0:
+            self._recent_writers.set(key, True)
+
+    def is_sticky(self, key: Optional[str]) -> bool:
+        return bool(key) and self._recent_writers.get(key, False)
+
+    def _load(self, index: int) -> int:
+        pool = self.engines[index].sync_engine.pool
+        return pool.checkedout() if isinstance(pool, QueuePool) else 0
 
-engine = create_engine(settings.DATABASE_URL)
+    def choose(self) -> int:
+        start = next(self._order)
+        if self.strategy == "least_loaded":
+            # Rotate the starting point so ties are spread round-robin
+            candidates = [(start + offset) % len(self.engines) for offset in range(len(self.engines))]
+            return min(candidates, key=self._load)
+        return start
+
+    def session(self) -> AsyncSession:
+        return self.sessionmakers[self.choose()]()
+
+    async def dispose(self) -> None:
+        for replica in self.engines:
+            await replica.dispose()
+
+engine = create_engine(settings.DATABASE_URL, **get_engine_options(settings.DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine_from_url(settings.DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=PrimarySession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+replica_router = ReplicaRouter(
+    settings.DATABASE_REPLICA_URLS,
+    strategy=settings.DATABASE_REPLICA_STRATEGY,
+    sticky_seconds=settings.DATABASE_REPLICA_STICKY_SECONDS
+) if settings.DATABASE_REPLICA_URLS else None
+
+instrument_engine("primary", async_engine.sync_engine)
+instrument_engine("primary_sync", engine)
+if replica_router is not None:
+    for index, replica in enumerate(replica_router.engines):
+        instrument_engine(f"replica_{index}", replica.sync_engine)
+
+@event.listens_for(PrimarySession, "after_commit")
+def _mark_recent_write(session):
+    if replica_router is not None:
+        replica_router.mark_write(session.info.get(STICKY_KEY))
+
 class Base(DeclarativeBase):
     pass
 
@@ -15,4 +138,21 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+async def get_async_db(request: Request):
+    async with AsyncSessionLocal() as db:
+        db.info[STICKY_KEY] = request.headers.get("authorization")
+        yield db
+
+async def get_read_db(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Session for read-only work: a replica when configured, else the primary.
+
+    Reuses the request's primary session (so overriding get_async_db also
+    covers reads) and keeps recent writers on the primary.
+    """
+    if replica_router is None or replica_router.is_sticky(request.headers.get("authorization")):
+        yield db
+        return
+    async with replica_router.session() as replica_db:
+        yield replica_db
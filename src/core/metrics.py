@@ -0,0 +1,166 @@
+import os
+import time
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.queries import add_query_observer, track_queries
+
+# With PROMETHEUS_MULTIPROC_DIR set (before import), prometheus_client writes
+# every worker's samples to mmap'd files there and /metrics aggregates them.
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+UNMATCHED_ROUTE = "<unmatched>"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+COMPRESSION_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by method, route template and status code",
+    ["method", "route", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method and route template",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL per HTTP request",
+    ["method", "route"],
+    buckets=DB_BUCKETS,
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_ACTIVE = Gauge(
+    "admission_active_requests",
+    "Requests holding an admission slot, by admission class",
+    ["admission_class"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "admission_queue_depth",
+    "Requests waiting for an admission slot, by admission class",
+    ["admission_class"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_WAIT = Histogram(
+    "admission_wait_seconds",
+    "Time requests waited for an admission slot",
+    ["admission_class"],
+    buckets=DB_BUCKETS,
+)
+ADMISSION_REJECTED = Counter(
+    "admission_rejected_total",
+    "Requests shed by admission control",
+    ["admission_class", "reason"],
+)
+COMPRESSION_SECONDS = Histogram(
+    "http_response_compression_seconds",
+    "CPU time spent compressing a response body, by encoding",
+    ["encoding"],
+    buckets=COMPRESSION_BUCKETS,
+)
+COMPRESSION_INPUT_BYTES = Counter(
+    "http_response_compression_input_bytes_total",
+    "Bytes of response bodies before compression, by encoding",
+    ["encoding"],
+)
+COMPRESSION_OUTPUT_BYTES = Counter(
+    "http_response_compression_output_bytes_total",
+    "Bytes of response bodies after compression, by encoding",
+    ["encoding"],
+)
+COMPRESSION_CACHE = Counter(
+    "http_response_compression_cache_total",
+    "Compressed body cache lookups by result (hit or miss)",
+    ["result"],
+)
+DB_QUERIES = Counter("db_queries_total", "SQL statements executed")
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time",
+    buckets=DB_BUCKETS,
+)
+
+def _observe_query(statement: str, elapsed: float) -> None:
+    DB_QUERIES.inc()
+    DB_QUERY_LATENCY.observe(elapsed)
+
+add_query_observer(_observe_query)
+
+def route_template(scope: Scope) -> str:
+    """Path template of the matched route (``/posts/{post_id}``), never the raw path"""
+    # Newer FastAPI resolves included routers lazily and keeps the prefixed
+    # template on the effective route context; older releases flatten them
+    route = scope.get("fastapi", {}).get("effective_route_context") or scope.get("route")
+    path = getattr(route, "path_format", None) or getattr(route, "path", None)
+    return path or UNMATCHED_ROUTE
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency, status and DB time per route.
+
+    Labels use the route template so cardinality stays bounded by the
+    number of routes; unmatched paths share a single label.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = IN_FLIGHT.labels(method)
+        in_flight.inc()
+        start = time.perf_counter()
+        with track_queries() as stats:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                elapsed = time.perf_counter() - start
+                in_flight.dec()
+                route = route_template(scope)
+                REQUESTS.labels(method, route, str(status_code)).inc()
+                REQUEST_LATENCY.labels(method, route).observe(elapsed)
+                REQUEST_DB_TIME.labels(method, route).observe(stats.seconds)
+
+def render_metrics() -> bytes:
+    """Prometheus text exposition, aggregated across workers in multiprocess mode"""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest()
+
+def mark_worker_dead(pid: int) -> None:
+    """Drop a worker's ``livesum`` gauges so /metrics stops counting them.
+
+    Each worker calls this for itself on lifespan shutdown, which covers
+    graceful exits and recycling after SERVER_MAX_REQUESTS.
+    """
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid)
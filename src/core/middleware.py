@@ -5,8 +5,8 @@ import time
 logger = logging.getLogger(__name__)
 
 async def log_request_middleware(request: Request, call_next):
-    start_time = time.time()
+    start_time = time.perf_counter()
     response = await call_next(request)
-    process_time = time.time() - start_time
-    logger.info(f"{request.method} {request.url.path} {response.status_code} {process_time:.2f}s")
-    return response 
\ No newline at end of file
+    process_time = time.perf_counter() - start_time
+    logger.info(f"{request.method} {request.url.path} {response.status_code} {process_time * 1000:.1f}ms")
+    return response
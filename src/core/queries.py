@@ -0,0 +1,161 @@
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+QueryObserver = Callable[[str, float], None]
+
+# Execution option marking a statement that legitimately runs many times in
+# one request (e.g. a bulk INSERT the dialect sends row by row)
+REPEATS_EXPECTED = "repeats_expected"
+
+class QueryStats:
+    """SQL statements executed while handling one request"""
+
+    __slots__ = ("count", "seconds", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, elapsed: float, repeats_expected: bool = False) -> None:
+        self.count += 1
+        self.seconds += elapsed
+        if not repeats_expected:
+            self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements executed at least ``threshold`` times, most frequent first"""
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+_observers: List[QueryObserver] = []
+_observers_lock = threading.Lock()
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Attribute statements run in this context (and tasks/threads it spawns) to one QueryStats.
+
+    Nested calls share the outer stats, so several middlewares can read the
+    same per-request totals.
+    """
+    stats = _current.get()
+    if stats is not None:
+        yield stats
+        return
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+def add_query_observer(observer: QueryObserver) -> None:
+    """Call ``observer(statement, elapsed)`` after every statement on any engine"""
+    with _observers_lock:
+        _observers.append(observer)
+
+def remove_query_observer(observer: QueryObserver) -> None:
+    with _observers_lock:
+        _observers.remove(observer)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = _current.get()
+    if stats is not None:
+        repeats_expected = context is not None and context.execution_options.get(REPEATS_EXPECTED, False)
+        stats.record(statement, elapsed, repeats_expected)
+    for observer in _observers:
+        observer(statement, elapsed)
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    if context.connection is not None:
+        starts = context.connection.info.get("query_start")
+        if starts:
+            starts.pop()
+
+@contextmanager
+def capture_queries() -> Iterator[List[str]]:
+    """Collect every statement executed on any engine, from any thread, inside the block"""
+    statements: List[str] = []
+    lock = threading.Lock()
+
+    def observer(statement: str, elapsed: float) -> None:
+        with lock:
+            statements.append(statement)
+
+    add_query_observer(observer)
+    try:
+        yield statements
+    finally:
+        remove_query_observer(observer)
+
+@contextmanager
+def assert_max_queries(n: int) -> Iterator[List[str]]:
+    """Fail if the block executes more than ``n`` SQL statements.
+
+        with assert_max_queries(3):
+            client.get("/api/v1/posts/1")
+    """
+    with capture_queries() as statements:
+        yield statements
+    if len(statements) > n:
+        listing = "\n".join(f"  {i}. {sql}" for i, sql in enumerate(statements, 1))
+        raise AssertionError(f"Expected at most {n} queries, {len(statements)} executed:\n{listing}")
+
+class QueryDebugMiddleware:
+    """Reports per-request SQL usage; installed in debug mode only.
+
+    Adds ``X-DB-Queries`` and a ``Server-Timing`` ``db`` entry to every
+    response and logs a warning when one statement repeats at least
+    ``repeat_threshold`` times in a request, the usual sign of an N+1
+    lazy load.
+    """
+
+    def __init__(self, app: ASGIApp, repeat_threshold: int = 5):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Queries"] = str(stats.count)
+                    headers.append("Server-Timing", f'db;dur={stats.seconds * 1000:.2f};desc="{stats.count} queries"')
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                if self.repeat_threshold > 0:
+                    for statement, times in stats.repeated(self.repeat_threshold):
+                        logger.warning(
+                            "Possible N+1: statement ran %d times in %s %s: %s",
+                            times, scope["method"], scope["path"], " ".join(statement.split())
+                        )
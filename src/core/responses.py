@@ -0,0 +1,82 @@
+import functools
+import inspect
+import json
+from typing import Any, Callable
+
+from fastapi import Response
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+from starlette.concurrency import run_in_threadpool
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, falling back to the stdlib encoder"""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _fast_serializing(endpoint: Callable, adapter: TypeAdapter, status_code: int) -> Callable:
+    """Wrap an endpoint so its result is validated and dumped to JSON in pydantic-core.
+
+    Endpoints returning a Response (e.g. a 304) pass through untouched.
+    Headers and status set on an injected ``Response`` parameter are
+    carried over, as FastAPI does for its own serialization path.
+    """
+    is_coroutine = inspect.iscoroutinefunction(endpoint)
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        if is_coroutine:
+            content = await endpoint(*args, **kwargs)
+        else:
+            content = await run_in_threadpool(endpoint, *args, **kwargs)
+        if isinstance(content, Response):
+            return content
+        body = adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+        response = Response(content=body, status_code=status_code, media_type="application/json")
+        for value in kwargs.values():
+            if isinstance(value, Response):
+                if value.status_code is not None:
+                    response.status_code = value.status_code
+                response.headers.raw.extend(value.headers.raw)
+        return response
+
+    return wrapper
+
+class FastJSONRoute(APIRoute):
+    """Route class that serializes ``response_model`` results in a single step.
+
+    A ``TypeAdapter`` is compiled once per route; each response is then
+    validated from ORM attributes and written straight to JSON bytes by
+    pydantic-core, skipping FastAPI's intermediate Python dict and JSON
+    encoder. Opt in per router with ``APIRouter(route_class=FastJSONRoute)``.
+    Routes using response_model include/exclude options keep the default
+    path.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        response_model = kwargs.get("response_model")
+        uses_filters = any(
+            kwargs.get(option) for option in (
+                "response_model_include",
+                "response_model_exclude",
+                "response_model_exclude_unset",
+                "response_model_exclude_defaults",
+                "response_model_exclude_none",
+            )
+        )
+        if response_model is not None and not isinstance(response_model, DefaultPlaceholder) and not uses_filters:
+            endpoint = _fast_serializing(
+                endpoint,
+                TypeAdapter(response_model),
+                status_code=kwargs.get("status_code") or 200
+            )
+        super().__init__(path, endpoint, **kwargs)
@@ -1,22 +1,215 @@
+import asyncio
+import base64
+import calendar
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional
 import bcrypt
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError
 from .config import settings
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+class PasswordHasherBusyError(HTTPException):
+    def __init__(self, retry_after: int = settings.PASSWORD_HASHER_RETRY_AFTER):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+def _checkpw(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(
         plain_password.encode('utf-8'),
         hashed_password.encode('utf-8')
     )
 
-def get_password_hash(password: str) -> str:
-    salt = bcrypt.gensalt()
+def _hashpw(password: str, rounds: int = settings.PASSWORD_BCRYPT_ROUNDS) -> str:
+    salt = bcrypt.gensalt(rounds=rounds)
     return bcrypt.hashpw(
         password.encode('utf-8'), 
         salt
     ).decode('utf-8')
 
+def bcrypt_rounds(hashed_password: str) -> Optional[int]:
+    """Cost factor stored in a ``$2b$<rounds>$...`` hash, or None if it isn't one"""
+    try:
+        return int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+def calibrate_rounds(target_ms: float, min_rounds: int = 10, max_rounds: int = 16, probe_rounds: int = 8) -> int:
+    """Highest bcrypt cost, within bounds, whose hash takes at most ``target_ms`` here.
+
+    Each extra round doubles the work, so one cheap probe predicts every
+    cost; the prediction is then checked once and stepped down if over.
+    """
+    def timed(rounds: int) -> float:
+        start = time.perf_counter()
+        _hashpw("calibration-password", rounds)
+        return (time.perf_counter() - start) * 1000
+
+    probe_ms = min(timed(probe_rounds) for _ in range(3))
+    rounds = min_rounds
+    while rounds < max_rounds and probe_ms * 2 ** (rounds + 1 - probe_rounds) <= target_ms:
+        rounds += 1
+    while rounds > min_rounds and timed(rounds) > target_ms:
+        rounds -= 1
+    return rounds
+
+class PasswordHasher:
+    """Bounded executor that keeps bcrypt off the event loop.
+
+    At most ``max_workers`` jobs run at once and ``queue_depth`` more may
+    wait; anything beyond that is rejected immediately with a 503 rather
+    than queueing without limit. Threads suit bcrypt, which releases the
+    GIL; ``mode="process"`` isolates hashing in worker processes instead.
+    """
+
+    def __init__(
+        self,
+        mode: str = "thread",
+        max_workers: Optional[int] = None,
+        queue_depth: int = 32,
+        rounds: int = 12
+    ):
+        self.mode = mode
+        self.rounds = rounds
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.queue_depth = queue_depth
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.mode == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.max_workers,
+                            thread_name_prefix="password-hasher"
+                        )
+        return self._executor
+
+    async def run(self, func, *args):
+        with self._lock:
+            if self._pending >= self.max_workers + self.queue_depth:
+                raise PasswordHasherBusyError()
+            self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+password_hasher = PasswordHasher(
+    mode=settings.PASSWORD_HASHER_MODE,
+    max_workers=settings.PASSWORD_HASHER_WORKERS,
+    queue_depth=settings.PASSWORD_HASHER_QUEUE_DEPTH,
+    rounds=settings.PASSWORD_BCRYPT_ROUNDS
+)
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run(_checkpw, plain_password, hashed_password)
+
+async def get_password_hash(password: str) -> str:
+    return await password_hasher.run(_hashpw, password, password_hasher.rounds)
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Whether a stored hash was made with a different cost than the current policy"""
+    return bcrypt_rounds(hashed_password) != password_hasher.rounds
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+class TokenCodec:
+    """JWT encode/decode with the key and header prepared once.
+
+    HMAC algorithms take a fast path: a keyed HMAC copied per call, a
+    pre-encoded header segment and only the ``exp``/``sub`` checks this
+    app relies on. Tokens are byte-compatible with python-jose, errors are
+    jose's ``JWTError`` subclasses, and any other algorithm is delegated
+    to jose unchanged.
+    """
+
+    _DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+    def __init__(self, secret_key: str, algorithm: str = "HS256", leeway: int = 0):
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+        self.leeway = leeway
+        digest = self._DIGESTS.get(algorithm)
+        self._mac = hmac.new(secret_key.encode("utf-8"), digestmod=digest) if digest else None
+        header = json.dumps({"alg": algorithm, "typ": "JWT"}, separators=(",", ":"), sort_keys=True)
+        self._header = _b64encode(header.encode("utf-8"))
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        mac = self._mac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        if self._mac is None:
+            return jwt.encode(claims, self.secret_key, algorithm=self.algorithm)
+        exp = claims.get("exp")
+        if isinstance(exp, datetime):
+            claims = {**claims, "exp": calendar.timegm(exp.utctimetuple())}
+        payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+        signing_input = self._header + b"." + payload
+        return (signing_input + b"." + _b64encode(self._sign(signing_input))).decode("ascii")
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        if self._mac is None:
+            return jwt.decode(token, self.secret_key, algorithms=[self.algorithm], options={"leeway": self.leeway})
+        try:
+            signing_input, _, signature = token.encode("ascii").rpartition(b".")
+            header, _, payload = signing_input.partition(b".")
+            if header != self._header and json.loads(_b64decode(header)).get("alg") != self.algorithm:
+                raise JWTError("The specified alg value is not allowed")
+            if not hmac.compare_digest(self._sign(signing_input), _b64decode(signature)):
+                raise JWTError("Signature verification failed.")
+            claims = json.loads(_b64decode(payload))
+        except (ValueError, AttributeError):
+            raise JWTError("Invalid token.")
+        if not isinstance(claims, dict):
+            raise JWTError("Invalid payload string: must be a json object")
+
+        if "exp" in claims:
+            try:
+                exp = int(claims["exp"])
+            except (TypeError, ValueError):
+                raise JWTClaimsError("Expiration Time claim (exp) must be an integer.")
+            if exp < int(time.time()) - self.leeway:
+                raise ExpiredSignatureError("Signature has expired.")
+        if "sub" in claims and not isinstance(claims["sub"], str):
+            raise JWTClaimsError("Subject must be a string.")
+        return claims
+
+token_codec = TokenCodec(settings.SECRET_KEY, settings.ALGORITHM, leeway=settings.JWT_LEEWAY)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -24,7 +217,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(
-        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
-    )
-    return encoded_jwt 
\ No newline at end of file
+    return token_codec.encode(to_encode)
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """Verified claims of ``token``; raises ``JWTError`` if it is invalid or expired"""
+    return token_codec.decode(token)
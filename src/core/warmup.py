@@ -0,0 +1,75 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+WarmupStep = Tuple[str, Callable[[], Awaitable[None]]]
+
+class WarmupState:
+    """Progress of the startup warmup, reported by the readiness probe"""
+
+    def __init__(self):
+        self.status = "pending"
+        self.steps: Dict[str, float] = {}
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    def mark_ready(self) -> None:
+        self.status = "ready"
+
+    def snapshot(self) -> dict:
+        duration = None
+        if self.started_at is not None:
+            duration = (self.finished_at or time.perf_counter()) - self.started_at
+        return {
+            "status": self.status,
+            "steps_ms": {name: seconds * 1000 for name, seconds in self.steps.items()},
+            "duration_ms": duration * 1000 if duration is not None else None,
+            "error": self.error,
+        }
+
+async def warm_pool(engine: AsyncEngine, connections: int) -> None:
+    """Open ``connections`` pool connections at once, then return them all to the pool"""
+    if connections <= 0:
+        return
+    opened = await asyncio.gather(
+        *(engine.connect().start() for _ in range(connections)),
+        return_exceptions=True
+    )
+    for connection in opened:
+        if not isinstance(connection, BaseException):
+            await connection.close()
+    for connection in opened:
+        if isinstance(connection, BaseException):
+            raise connection
+
+async def run_warmup(state: WarmupState, steps: List[WarmupStep]) -> None:
+    """Run warmup steps in order, timing each; a failing step leaves the app unready"""
+    state.status = "warming"
+    state.started_at = time.perf_counter()
+    try:
+        for name, step in steps:
+            start = time.perf_counter()
+            await step()
+            state.steps[name] = time.perf_counter() - start
+    except asyncio.CancelledError:
+        state.status = "cancelled"
+        raise
+    except Exception as exc:
+        state.status = "failed"
+        state.error = f"{name}: {exc!r}"
+        logger.warning("Warmup step %s failed", name, exc_info=True)
+    else:
+        state.mark_ready()
+        logger.info("Warmup finished in %.1fms", (time.perf_counter() - state.started_at) * 1000)
+    finally:
+        state.finished_at = time.perf_counter()
@@ -1,29 +1,181 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager, suppress
+from typing import Optional
+
+from fastapi import FastAPI, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 
-from src.core.config import settings
+from src.core.admission import AdmissionControlMiddleware, AdmissionController
+from src.core.cache import LRUCache, cache
+from src.core.compression import CompressionMiddleware, build_encoders
+from src.core.config import Settings, get_settings
+from src.core.database import AsyncSessionLocal, async_engine, engine, replica_router
+from src.core.metrics import CONTENT_TYPE_LATEST, MetricsMiddleware, mark_worker_dead, render_metrics
+from src.core.middleware import log_request_middleware
+from src.core.queries import QueryDebugMiddleware
+from src.core.pool import get_pool_stats
+from src.core.security import calibrate_rounds, password_hasher
+from src.core.warmup import WarmupState, run_warmup, warm_pool
+from src.auth import service as auth_service
 from src.auth.router import router as auth_router
-from src.posts.router import router as posts_router
-
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    version=settings.VERSION,
-    debug=settings.DEBUG
-)
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.ALLOWED_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include routers
-app.include_router(auth_router, prefix=settings.API_V1_STR)
-app.include_router(posts_router, prefix=settings.API_V1_STR)
-
-@app.get("/")
-async def root():
-    return {"message": "Welcome to FastAPI Template"} 
\ No newline at end of file
+from src.posts import service as posts_service
+from src.posts.router import feeds_router, router as posts_router
+
+logger = logging.getLogger(__name__)
+
+def _warmup_steps(app: FastAPI, settings: Settings):
+    connections = min(settings.DB_POOL_WARMUP, settings.DB_POOL_SIZE)
+    engines = [async_engine] + (replica_router.engines if replica_router is not None else [])
+    sessionmakers = [AsyncSessionLocal] + (replica_router.sessionmakers if replica_router is not None else [])
+
+    async def build_openapi():
+        app.openapi()
+
+    async def connect_pools():
+        await asyncio.gather(*(warm_pool(e, connections) for e in engines))
+
+    async def prime_statements():
+        for sessionmaker in sessionmakers:
+            async with sessionmaker() as db:
+                await auth_service.prime_statement_cache(db)
+                await posts_service.prime_statement_cache(db)
+
+    return [
+        ("openapi", build_openapi),
+        ("pool", connect_pools),
+        ("statements", prime_statements),
+    ]
+
+async def _close_resources() -> None:
+    await async_engine.dispose()
+    if replica_router is not None:
+        await replica_router.dispose()
+    engine.dispose()
+    await cache.close()
+    password_hasher.shutdown(wait=False)
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """Build the application.
+
+    The lifespan warms pools, the OpenAPI schema and statement caches in
+    the background (``/health/ready`` reports progress) and disposes
+    engines and executors on shutdown.
+    """
+    settings = settings or get_settings()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        if settings.PASSWORD_BCRYPT_CALIBRATE:
+            password_hasher.rounds = await asyncio.to_thread(
+                calibrate_rounds,
+                settings.PASSWORD_HASH_TARGET_MS,
+                settings.PASSWORD_BCRYPT_MIN_ROUNDS,
+                settings.PASSWORD_BCRYPT_MAX_ROUNDS
+            )
+            logger.info("Calibrated bcrypt cost to %d rounds", password_hasher.rounds)
+        app.state.warmup = WarmupState()
+        warmup_task = None
+        if settings.WARMUP_ENABLED:
+            warmup_task = asyncio.create_task(run_warmup(app.state.warmup, _warmup_steps(app, settings)))
+        else:
+            app.state.warmup.mark_ready()
+        try:
+            yield
+        finally:
+            if warmup_task is not None:
+                warmup_task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await warmup_task
+            await _close_resources()
+            mark_worker_dead(os.getpid())
+
+    app = FastAPI(
+        title=settings.PROJECT_NAME,
+        version=settings.VERSION,
+        debug=settings.DEBUG,
+        lifespan=lifespan
+    )
+
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.ALLOWED_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    if settings.COMPRESSION_ENABLED:
+        app.add_middleware(
+            CompressionMiddleware,
+            encoders=build_encoders(
+                settings.COMPRESSION_ENCODINGS,
+                gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+                brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+                zstd_level=settings.COMPRESSION_ZSTD_LEVEL
+            ),
+            minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+            cache=LRUCache(maxsize=settings.COMPRESSION_CACHE_SIZE) if settings.COMPRESSION_CACHE_SIZE > 0 else None
+        )
+    app.middleware("http")(log_request_middleware)
+    if settings.DEBUG:
+        app.add_middleware(QueryDebugMiddleware, repeat_threshold=settings.DB_REPEATED_QUERY_THRESHOLD)
+    admission = AdmissionController(settings.ADMISSION_CLASSES, settings.ADMISSION_EXEMPT_PATHS)
+    if settings.ADMISSION_ENABLED:
+        # Ahead of everything but metrics, so shed requests cost almost nothing
+        app.add_middleware(
+            AdmissionControlMiddleware,
+            controller=admission,
+            retry_after=settings.ADMISSION_RETRY_AFTER
+        )
+    if settings.METRICS_ENABLED:
+        # Outermost, so latency covers every other middleware too
+        app.add_middleware(MetricsMiddleware)
+
+    # Include routers
+    app.include_router(auth_router, prefix=settings.API_V1_STR)
+    app.include_router(posts_router, prefix=settings.API_V1_STR)
+    app.include_router(feeds_router, prefix=settings.API_V1_STR)
+
+    @app.get("/")
+    async def root():
+        return {"message": "Welcome to FastAPI Template"}
+
+    @app.get("/health/live", include_in_schema=False)
+    async def liveness():
+        return {"status": "alive"}
+
+    @app.get("/health/ready", include_in_schema=False)
+    async def readiness(request: Request, response: Response):
+        warmup = getattr(request.app.state, "warmup", None)
+        if warmup is None or not warmup.ready:
+            response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {
+            "status": "ready" if warmup is not None and warmup.ready else "unavailable",
+            "warmup": warmup.snapshot() if warmup is not None else None,
+        }
+
+    if settings.DEBUG:
+        @app.get("/stats/db-pool", include_in_schema=False)
+        async def db_pool_stats():
+            return get_pool_stats()
+
+    if settings.DEBUG:
+        @app.get("/stats/admission", include_in_schema=False)
+        async def admission_stats():
+            return admission.stats()
+
+    if settings.DEBUG:
+        @app.get("/stats/cache", include_in_schema=False)
+        async def cache_stats():
+            return cache.stats()
+
+    if settings.METRICS_ENABLED:
+        @app.get(settings.METRICS_PATH, include_in_schema=False)
+        async def metrics():
+            return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+    return app
+
+app = create_app()
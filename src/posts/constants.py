@@ -2,6 +2,27 @@
 DEFAULT_POSTS_LIMIT = 10
 MAX_POSTS_LIMIT = 100
 
+# Total count strategies for paginated listings
+COUNT_NONE = "none"
+COUNT_ESTIMATE = "estimate"
+COUNT_EXACT = "exact"
+
+# Export formats
+EXPORT_NDJSON = "ndjson"
+EXPORT_CSV = "csv"
+
+# Full-text search
+SEARCH_HIGHLIGHT_START = "<mark>"
+SEARCH_HIGHLIGHT_STOP = "</mark>"
+SEARCH_SNIPPET_WORDS = 24
+
+# Keyset pagination directions
+CURSOR_NEXT = "next"
+CURSOR_PREV = "prev"
+MAX_CURSOR_ID = 2**31 - 1  # posts.id is a 32-bit INTEGER column
+
 # Error Messages
 POST_NOT_FOUND_MSG = "Post not found"
-UNAUTHORIZED_MSG = "Not authorized to perform this action" 
\ No newline at end of file
+UNAUTHORIZED_MSG = "Not authorized to perform this action"
+INVALID_CURSOR_MSG = "Invalid pagination cursor"
+SEARCH_NOT_SUPPORTED_MSG = "Search is not supported on this database"
@@ -1,15 +1,15 @@
 from fastapi import Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from src.core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.database import get_async_db
 from src.auth.dependencies import get_current_user
-from . import models
+from . import models, service
 from .constants import UNAUTHORIZED_MSG
 
 async def get_post_by_id(
     post_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    post = db.query(models.Post).filter(models.Post.id == post_id).first()
+    post = await service.get_post(db, post_id=post_id)
     if post is None:
         raise HTTPException(status_code=404, detail="Post not found")
     return post
@@ -23,4 +23,4 @@ async def verify_post_owner(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=UNAUTHORIZED_MSG
         )
-    return post 
\ No newline at end of file
+    return post
@@ -1,5 +1,5 @@
 from fastapi import HTTPException, status
-from .constants import POST_NOT_FOUND_MSG, UNAUTHORIZED_MSG
+from .constants import INVALID_CURSOR_MSG, POST_NOT_FOUND_MSG, SEARCH_NOT_SUPPORTED_MSG, UNAUTHORIZED_MSG
 
 class PostNotFoundError(HTTPException):
     def __init__(self, detail: str = POST_NOT_FOUND_MSG):
@@ -13,4 +13,18 @@ class UnauthorizedPostAccessError(HTTPException):
         super().__init__(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=detail
-        ) 
\ No newline at end of file
+        ) 
+
+class InvalidCursorError(HTTPException):
+    def __init__(self, detail: str = INVALID_CURSOR_MSG):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail
+        )
+
+class SearchNotSupportedError(HTTPException):
+    def __init__(self, detail: str = SEARCH_NOT_SUPPORTED_MSG):
+        super().__init__(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=detail
+        )
@@ -1,46 +1,206 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.database import get_db
+from src.core.config import settings
+from src.core.database import get_async_db, get_read_db
+from src.core.responses import FastJSONRoute, ORJSONResponse
 from src.auth.dependencies import get_current_user
 from src.auth.schemas import User
-from . import schemas, service, models
+from . import schemas, service, utils
+from .exceptions import InvalidCursorError
 
-router = APIRouter(prefix="/posts", tags=["posts"])
+router = APIRouter(
+    prefix="/posts",
+    tags=["posts"],
+    route_class=FastJSONRoute,
+    default_response_class=ORJSONResponse
+)
+# Author feeds live under the user they belong to
+feeds_router = APIRouter(
+    tags=["posts"],
+    route_class=FastJSONRoute,
+    default_response_class=ORJSONResponse
+)
 
 @router.post("/", response_model=schemas.Post)
-def create_post(
+async def create_post(
     post: schemas.PostCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    return service.create_post(db=db, post=post, user_id=current_user.id)
+    return await service.create_post(db=db, post=post, user_id=current_user.id)
+
+@router.post("/bulk", response_model=schemas.PostBulkResult)
+async def create_posts_bulk(
+    posts: List[schemas.PostCreate] = Body(..., min_length=1, max_length=settings.POSTS_BULK_MAX_ITEMS),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    created = await service.create_posts_bulk(db=db, posts=posts, user_id=current_user.id)
+    return {"items": created, "count": len(created)}
 
 @router.get("/", response_model=schemas.PostPage)
-def get_posts(
+async def get_posts(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db)
+    count: schemas.CountMode = Query(schemas.CountMode.exact),
+    db: AsyncSession = Depends(get_read_db)
 ):
     skip = (page - 1) * size
-    total = db.query(models.Post).count()
-    posts = db.query(models.Post)\
-        .offset(skip)\
-        .limit(size)\
-        .all()
+    if count == schemas.CountMode.exact:
+        total = await service.count_posts(db)
+    elif count == schemas.CountMode.estimate:
+        total = await service.estimate_post_count(db)
+    else:
+        total = None
+
+    # Revalidate against (id, updated_at) alone before loading post bodies
+    if utils.has_conditional_headers(request, by_date=False):
+        versions = await service.get_posts(db, skip=skip, limit=size, columns=service.POST_VERSION_COLUMNS)
+        etag, last_modified = utils.page_validators(versions, total, page, size, count.value)
+        if utils.is_not_modified(request, etag, last_modified):
+            return utils.not_modified_response(etag, last_modified)
+
+    posts = await service.get_posts(db, skip=skip, limit=size)
+    utils.set_validators(response, *utils.page_validators(posts, total, page, size, count.value))
     
     return {
         "items": posts,
         "total": total,
         "page": page,
         "size": size,
-        "pages": (total + size - 1) // size
+        "pages": (total + size - 1) // size if total is not None else None,
+        "approximate": count == schemas.CountMode.estimate
     }
 
+@router.get("/cursor", response_model=schemas.PostCursorPage)
+async def get_posts_by_cursor(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None),
+    size: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db)
+):
+    try:
+        if utils.has_conditional_headers(request, by_date=False):
+            versions, next_cursor, prev_cursor = await service.get_posts_keyset(
+                db, cursor=cursor, limit=size, columns=service.POST_VERSION_COLUMNS
+            )
+            etag, last_modified = utils.page_validators(versions, next_cursor, prev_cursor, size)
+            if utils.is_not_modified(request, etag, last_modified):
+                return utils.not_modified_response(etag, last_modified)
+        posts, next_cursor, prev_cursor = await service.get_posts_keyset(db, cursor=cursor, limit=size)
+    except ValueError:
+        raise InvalidCursorError()
+    utils.set_validators(response, *utils.page_validators(posts, next_cursor, prev_cursor, size))
+
+    return {
+        "items": posts,
+        "size": size,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor
+    }
+
+@router.get("/search", response_model=schemas.PostSearchPage)
+async def search_posts(
+    q: str = Query(..., min_length=1, max_length=256),
+    cursor: Optional[str] = Query(None),
+    size: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db)
+):
+    try:
+        hits, next_cursor = await service.search_posts(db, q=q, cursor=cursor, limit=size)
+    except ValueError:
+        raise InvalidCursorError()
+
+    return {
+        "items": hits,
+        "size": size,
+        "next_cursor": next_cursor
+    }
+
+@router.get("/export")
+async def export_posts(
+    format: schemas.ExportFormat = Query(schemas.ExportFormat.ndjson),
+    author_id: Optional[int] = Query(None),
+    created_after: Optional[datetime] = Query(None),
+    created_before: Optional[datetime] = Query(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    batches = service.stream_posts(
+        db,
+        author_id=author_id,
+        created_after=created_after,
+        created_before=created_before
+    )
+    if format == schemas.ExportFormat.csv:
+        columns = [column.key for column in service.POST_EXPORT_COLUMNS]
+        return StreamingResponse(
+            utils.csv_lines(batches, columns),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="posts.csv"'}
+        )
+    return StreamingResponse(
+        utils.ndjson_lines(batches),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="posts.ndjson"'}
+    )
+
 @router.get("/{post_id}", response_model=schemas.Post)
-def read_post(post_id: int, db: Session = Depends(get_db)):
-    post = service.get_post(db, post_id=post_id)
+async def read_post(
+    post_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db)
+):
+    if utils.has_conditional_headers(request):
+        updated_at = await service.get_post_updated_at(db, post_id=post_id)
+        if updated_at is None:
+            raise HTTPException(status_code=404, detail="Post not found")
+        etag, last_modified = utils.post_validators(post_id, updated_at)
+        if utils.is_not_modified(request, etag, last_modified):
+            return utils.not_modified_response(etag, last_modified)
+
+    post = await service.get_post(db, post_id=post_id)
     if post is None:
         raise HTTPException(status_code=404, detail="Post not found")
-    return post 
\ No newline at end of file
+    utils.set_validators(response, *utils.post_validators(post.id, post.updated_at))
+    return post
+
+async def _author_feed(db: AsyncSession, author_id: int, cursor: Optional[str], size: int):
+    try:
+        posts, next_cursor, prev_cursor = await service.get_posts_keyset(
+            db, cursor=cursor, limit=size, author_id=author_id
+        )
+    except ValueError:
+        raise InvalidCursorError()
+
+    return {
+        "items": posts,
+        "size": size,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor
+    }
+
+@feeds_router.get("/users/{user_id}/posts", response_model=schemas.PostCursorPage)
+async def get_user_posts(
+    user_id: int,
+    cursor: Optional[str] = Query(None),
+    size: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await _author_feed(db, user_id, cursor, size)
+
+@feeds_router.get("/me/posts", response_model=schemas.PostCursorPage)
+async def get_my_posts(
+    cursor: Optional[str] = Query(None),
+    size: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    return await _author_feed(db, current_user.id, cursor, size)
@@ -1,6 +1,18 @@
 from datetime import datetime
+from enum import Enum
 from pydantic import BaseModel, ConfigDict
-from typing import List
+from typing import List, Optional
+
+from .constants import COUNT_ESTIMATE, COUNT_EXACT, COUNT_NONE, EXPORT_CSV, EXPORT_NDJSON
+
+class CountMode(str, Enum):
+    none = COUNT_NONE
+    estimate = COUNT_ESTIMATE
+    exact = COUNT_EXACT
+
+class ExportFormat(str, Enum):
+    ndjson = EXPORT_NDJSON
+    csv = EXPORT_CSV
 
 class PostBase(BaseModel):
     title: str
@@ -17,11 +29,40 @@ class Post(PostBase):
     updated_at: datetime
     author_id: int 
 
+class PostSearchHit(Post):
+    rank: float
+    snippet: str
+
+class PostSearchPage(BaseModel):
+    items: List[PostSearchHit]
+    size: int
+    next_cursor: Optional[str] = None
+
+class PostCreated(BaseModel):
+    id: int
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+class PostBulkResult(BaseModel):
+    items: List[PostCreated]
+    count: int
+
 class PostPage(BaseModel):
     items: List[Post]
-    total: int
+    total: Optional[int] = None
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    approximate: bool = False  # True when total/pages come from an estimate
     
-    model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class PostCursorPage(BaseModel):
+    items: List[Post]
+    size: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,18 +1,320 @@
-from sqlalchemy.orm import Session
-from . import models, schemas
-from .constants import DEFAULT_POSTS_LIMIT, MAX_POSTS_LIMIT
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+from sqlalchemy import DateTime, Float, Integer, String, Text, func, insert, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.cache import cache
+from src.core.config import settings
+from src.core.queries import REPEATS_EXPECTED
+from . import models, schemas, utils
+from .exceptions import SearchNotSupportedError
+from .constants import (
+    CURSOR_NEXT,
+    CURSOR_PREV,
+    DEFAULT_POSTS_LIMIT,
+    MAX_POSTS_LIMIT,
+    SEARCH_HIGHLIGHT_START,
+    SEARCH_HIGHLIGHT_STOP,
+    SEARCH_SNIPPET_WORDS,
+)
 
-def get_post(db: Session, post_id: int):
-    return db.query(models.Post).filter(models.Post.id == post_id).first()
+post_count_cache = utils.CountCache(ttl=settings.POSTS_COUNT_CACHE_TTL)
 
-def get_posts(db: Session, skip: int = 0, limit: int = DEFAULT_POSTS_LIMIT):
+# Columns written by the export, in output order
+POST_EXPORT_COLUMNS = (
+    models.Post.id,
+    models.Post.title,
+    models.Post.content,
+    models.Post.created_at,
+    models.Post.updated_at,
+    models.Post.author_id,
+)
+
+# Just enough of a post to build pagination cursors and HTTP validators
+POST_VERSION_COLUMNS = (models.Post.id, models.Post.created_at, models.Post.updated_at)
+
+def post_cache_key(post_id: int) -> str:
+    return f"post:{post_id}"
+
+async def invalidate_post(post_id: int) -> None:
+    """Drop a post from the read-through cache; call after any write to it"""
+    await cache.delete(post_cache_key(post_id))
+
+async def get_post(db: AsyncSession, post_id: int) -> Optional[schemas.Post]:
+    key = post_cache_key(post_id)
+    cached = await cache.get(key)
+    if cached is not None:
+        return schemas.Post.model_validate_json(cached)
+    result = await db.execute(select(models.Post).where(models.Post.id == post_id))
+    db_post = result.scalars().first()
+    if db_post is None:
+        return None
+    post = schemas.Post.model_validate(db_post)
+    await cache.set(key, post.model_dump_json(), ttl=settings.POSTS_CACHE_TTL)
+    return post
+
+async def get_post_updated_at(db: AsyncSession, post_id: int) -> Optional[datetime]:
+    """Last modification time of a post, without loading its body"""
+    cached = await cache.get(post_cache_key(post_id))
+    if cached is not None:
+        return schemas.Post.model_validate_json(cached).updated_at
+    result = await db.execute(select(models.Post.updated_at).where(models.Post.id == post_id))
+    return result.scalar()
+
+async def get_posts(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = DEFAULT_POSTS_LIMIT,
+    columns: Optional[Sequence] = None
+):
+    """Offset page of posts; pass ``columns`` to fetch rows of just those columns"""
     if limit > MAX_POSTS_LIMIT:
         limit = MAX_POSTS_LIMIT
-    return db.query(models.Post).offset(skip).limit(limit).all()
+    stmt = select(*columns) if columns else select(models.Post)
+    result = await db.execute(stmt.order_by(models.Post.id).offset(skip).limit(limit))
+    return result.all() if columns else result.scalars().all()
+
+async def count_posts(db: AsyncSession) -> int:
+    """Exact number of posts; also refreshes the cached total"""
+    result = await db.execute(select(func.count()).select_from(models.Post))
+    total = result.scalar_one()
+    post_count_cache.set(total)
+    return total
+
+async def estimate_post_count(db: AsyncSession) -> int:
+    """Approximate number of posts without scanning the table.
+
+    Serves the cached total while it is fresh (create_post keeps it current
+    in this process), then falls back to the planner's row estimate on
+    PostgreSQL, and only counts exactly when neither is available.
+    """
+    total = post_count_cache.get()
+    if total is not None:
+        return total
+    if db.get_bind().dialect.name == "postgresql":
+        result = await db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": models.Post.__tablename__}
+        )
+        estimate = result.scalar()
+        # reltuples is -1 until the table has been vacuumed or analyzed
+        if estimate is not None and estimate >= 0:
+            post_count_cache.set(estimate)
+            return estimate
+    return await count_posts(db)
+
+async def get_posts_keyset(
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_POSTS_LIMIT,
+    columns: Optional[Sequence] = None,
+    author_id: Optional[int] = None
+) -> Tuple[List[models.Post], Optional[str], Optional[str]]:
+    """Return a page of posts, newest first, positioned by an opaque cursor.
+
+    Seeks on the (created_at, id) index instead of skipping rows, so every
+    page costs the same regardless of depth; with ``author_id`` the
+    (author_id, created_at, id) index serves a single author's feed.
+    ``columns`` (which must include id and created_at) fetches rows of
+    just those columns. Raises ValueError for a malformed cursor.
+    """
+    if limit > MAX_POSTS_LIMIT:
+        limit = MAX_POSTS_LIMIT
+    key = tuple_(models.Post.created_at, models.Post.id)
+    stmt = select(*columns) if columns else select(models.Post)
+    if author_id is not None:
+        stmt = utils.filter_user_posts(stmt, author_id)
+    direction = CURSOR_NEXT
+    if cursor is not None:
+        created_at, post_id, direction = utils.decode_cursor(cursor)
+        if direction == CURSOR_PREV:
+            stmt = stmt.where(key > tuple_(created_at, post_id))
+        else:
+            stmt = stmt.where(key < tuple_(created_at, post_id))
+    stmt = utils.sort_posts_by_date(stmt, ascending=direction == CURSOR_PREV)
+
+    # Fetch one extra row to learn whether another page exists
+    result = await db.execute(stmt.limit(limit + 1))
+    posts = list(result.all() if columns else result.scalars().all())
+    has_more = len(posts) > limit
+    posts = posts[:limit]
+    if direction == CURSOR_PREV:
+        posts.reverse()
+    if not posts:
+        return posts, None, None
+
+    first, last = posts[0], posts[-1]
+    if direction == CURSOR_PREV:
+        next_cursor = utils.encode_cursor(last.created_at, last.id, CURSOR_NEXT)
+        prev_cursor = utils.encode_cursor(first.created_at, first.id, CURSOR_PREV) if has_more else None
+    else:
+        next_cursor = utils.encode_cursor(last.created_at, last.id, CURSOR_NEXT) if has_more else None
+        prev_cursor = utils.encode_cursor(first.created_at, first.id, CURSOR_PREV) if cursor else None
+    return posts, next_cursor, prev_cursor
 
-def create_post(db: Session, post: schemas.PostCreate, user_id: int):
+# Ranked matches per dialect; both expose the same columns so the keyset
+# filter and ordering below can be shared. Higher rank is a better match.
+_SEARCH_SQL = {
+    "postgresql": """
+        SELECT ranked.*, ts_headline('english', ranked.content, websearch_to_tsquery('english', :q),
+                                     :headline_options) AS snippet
+        FROM (
+            SELECT posts.id, posts.title, posts.content, posts.created_at, posts.updated_at,
+                   posts.author_id, ts_rank_cd(posts.search_vector, query) AS rank
+            FROM posts, websearch_to_tsquery('english', :q) AS query
+            WHERE posts.search_vector @@ query
+        ) AS ranked
+        {keyset}
+        ORDER BY ranked.rank DESC, ranked.id DESC
+        LIMIT :limit
+    """,
+    "sqlite": """
+        SELECT * FROM (
+            SELECT posts.id, posts.title, posts.content, posts.created_at, posts.updated_at,
+                   posts.author_id, -bm25(posts_fts) AS rank,
+                   snippet(posts_fts, -1, :start_sel, :stop_sel, '...', :snippet_words) AS snippet
+            FROM posts_fts JOIN posts ON posts.id = posts_fts.rowid
+            WHERE posts_fts MATCH :q
+        ) AS ranked
+        {keyset}
+        ORDER BY ranked.rank DESC, ranked.id DESC
+        LIMIT :limit
+    """,
+}
+
+_HEADLINE_OPTIONS = (
+    f"StartSel={SEARCH_HIGHLIGHT_START}, StopSel={SEARCH_HIGHLIGHT_STOP}, "
+    f"MaxWords={SEARCH_SNIPPET_WORDS}, MinWords={SEARCH_SNIPPET_WORDS // 2}"
+)
+
+async def search_posts(
+    db: AsyncSession,
+    q: str,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_POSTS_LIMIT
+):
+    """Ranked full-text search over title and content with highlighted snippets.
+
+    Uses the tsvector GIN index on PostgreSQL and the FTS5 table on SQLite.
+    Pages are keyed on (rank, id). Raises SearchNotSupportedError on other
+    databases and ValueError for a malformed cursor.
+    """
+    if limit > MAX_POSTS_LIMIT:
+        limit = MAX_POSTS_LIMIT
+    dialect = db.get_bind().dialect.name
+    if dialect not in _SEARCH_SQL:
+        raise SearchNotSupportedError()
+    if not q.strip():
+        return [], None
+
+    if dialect == "sqlite":
+        params = {
+            "q": utils.fts5_query(q),
+            "start_sel": SEARCH_HIGHLIGHT_START,
+            "stop_sel": SEARCH_HIGHLIGHT_STOP,
+            "snippet_words": SEARCH_SNIPPET_WORDS,
+        }
+    else:
+        params = {"q": q, "headline_options": _HEADLINE_OPTIONS}
+    params["limit"] = limit + 1
+    keyset = ""
+    if cursor is not None:
+        params["cursor_rank"], params["cursor_id"] = utils.decode_search_cursor(cursor)
+        keyset = (
+            "WHERE ranked.rank < :cursor_rank "
+            "OR (ranked.rank = :cursor_rank AND ranked.id < :cursor_id)"
+        )
+
+    stmt = text(_SEARCH_SQL[dialect].format(keyset=keyset)).columns(
+        id=Integer,
+        title=String,
+        content=Text,
+        created_at=DateTime,
+        updated_at=DateTime,
+        author_id=Integer,
+        rank=Float,
+        snippet=Text,
+    )
+    result = await db.execute(stmt, params)
+    hits = list(result.all())
+    has_more = len(hits) > limit
+    hits = hits[:limit]
+    next_cursor = utils.encode_search_cursor(hits[-1].rank, hits[-1].id) if has_more else None
+    return hits, next_cursor
+
+async def create_post(db: AsyncSession, post: schemas.PostCreate, user_id: int):
     db_post = models.Post(**post.model_dump(), author_id=user_id)
     db.add(db_post)
-    db.commit()
-    db.refresh(db_post)
-    return db_post 
\ No newline at end of file
+    await db.commit()
+    await db.refresh(db_post)
+    post_count_cache.increment()
+    await invalidate_post(db_post.id)
+    return db_post
+
+async def create_posts_bulk(
+    db: AsyncSession,
+    posts: List[schemas.PostCreate],
+    user_id: int,
+    chunk_size: int = settings.POSTS_BULK_CHUNK_SIZE
+):
+    """Insert many posts in one transaction using multi-row INSERT ... RETURNING.
+
+    Rows are sent ``chunk_size`` at a time and the returned (id, created_at,
+    updated_at) rows come back in the order the posts were given. SQLite
+    cannot guarantee RETURNING order for a multi-row INSERT, so there
+    SQLAlchemy sends one INSERT per row (still in a single transaction);
+    those repeats are expected and kept out of the N+1 warning.
+    """
+    stmt = insert(models.Post).returning(
+        models.Post.id,
+        models.Post.created_at,
+        models.Post.updated_at,
+        sort_by_parameter_order=True
+    ).execution_options(**{REPEATS_EXPECTED: True})
+    created = []
+    for start in range(0, len(posts), chunk_size):
+        chunk = posts[start:start + chunk_size]
+        result = await db.execute(
+            stmt,
+            [{**post.model_dump(), "author_id": user_id} for post in chunk]
+        )
+        created.extend(result.all())
+    await db.commit()
+    post_count_cache.increment(len(created))
+    return created
+
+async def stream_posts(
+    db: AsyncSession,
+    author_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    batch_size: int = settings.POSTS_EXPORT_BATCH_SIZE
+) -> AsyncIterator[Sequence]:
+    """Yield batches of export rows read through a server-side cursor.
+
+    Only ``batch_size`` rows are held in memory at a time, however many
+    posts match.
+    """
+    stmt = select(*POST_EXPORT_COLUMNS).order_by(models.Post.id)
+    if author_id is not None:
+        stmt = stmt.where(models.Post.author_id == author_id)
+    if created_after is not None:
+        stmt = stmt.where(models.Post.created_at >= utils.as_naive_utc(created_after))
+    if created_before is not None:
+        stmt = stmt.where(models.Post.created_at < utils.as_naive_utc(created_before))
+    result = await db.stream(stmt.execution_options(yield_per=batch_size))
+    async for partition in result.partitions():
+        yield partition
+
+async def prime_statement_cache(db: AsyncSession) -> None:
+    """Run each hot read query once so its compiled form is cached before traffic arrives.
+
+    The exact count is left out on purpose: it scans the whole table, once
+    per engine in every worker, which is what ``count=estimate`` avoids.
+    """
+    await get_posts(db, limit=1)
+    await get_posts(db, limit=1, columns=POST_VERSION_COLUMNS)
+    await get_posts_keyset(db, limit=1)
+    await get_posts_keyset(db, cursor=utils.encode_cursor(datetime.utcnow(), 0, CURSOR_NEXT), limit=1)
+    await get_posts_keyset(db, limit=1, author_id=0)
+    await db.execute(select(models.Post).where(models.Post.id == 0))
+    await db.execute(select(models.Post.updated_at).where(models.Post.id == 0))
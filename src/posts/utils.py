@@ -1,10 +1,194 @@
-from typing import List
-from . import models
+import base64
+import csv
+import hashlib
+import io
+import json
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, AsyncIterator, Optional, Sequence, Tuple
+from fastapi import Request, Response, status
+from sqlalchemy import Select
+from . import models, schemas
+from .constants import CURSOR_NEXT, CURSOR_PREV, MAX_CURSOR_ID
 
-def filter_user_posts(posts: List[models.Post], user_id: int) -> List[models.Post]:
-    """Filter posts by user_id"""
-    return [post for post in posts if post.author_id == user_id]
+def filter_user_posts(stmt: Select, user_id: int) -> Select:
+    """Restrict a posts query to one author"""
+    return stmt.where(models.Post.author_id == user_id)
 
-def sort_posts_by_date(posts: List[models.Post], ascending: bool = False) -> List[models.Post]:
-    """Sort posts by created_at date"""
-    return sorted(posts, key=lambda x: x.created_at, reverse=not ascending) 
\ No newline at end of file
+def sort_posts_by_date(stmt: Select, ascending: bool = False) -> Select:
+    """Order a posts query by created_at date, with id breaking ties"""
+    if ascending:
+        return stmt.order_by(models.Post.created_at.asc(), models.Post.id.asc())
+    return stmt.order_by(models.Post.created_at.desc(), models.Post.id.desc())
+
+def _encode_token(values: list) -> str:
+    payload = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).rstrip(b"=").decode("ascii")
+
+def _decode_token(token: str) -> Any:
+    padded = token + "=" * (-len(token) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded))
+
+def _is_cursor_id(value: Any) -> bool:
+    # bool is an int subclass; out-of-range ids would fail in the driver instead
+    return isinstance(value, int) and not isinstance(value, bool) and 0 <= value <= MAX_CURSOR_ID
+
+def encode_cursor(created_at: datetime, post_id: int, direction: str = CURSOR_NEXT) -> str:
+    """Encode a (created_at, id) keyset position into an opaque cursor token"""
+    return _encode_token([created_at.isoformat(), post_id, direction])
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int, str]:
+    """Decode a cursor token, raising ValueError if it is malformed"""
+    try:
+        created_at, post_id, direction = _decode_token(cursor)
+        created_at = datetime.fromisoformat(created_at)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Malformed cursor") from exc
+    if not _is_cursor_id(post_id) or direction not in (CURSOR_NEXT, CURSOR_PREV):
+        raise ValueError("Malformed cursor")
+    return created_at, post_id, direction
+
+def encode_search_cursor(rank: float, post_id: int) -> str:
+    """Encode a (rank, id) position in ranked search results"""
+    return _encode_token([rank, post_id])
+
+def decode_search_cursor(cursor: str) -> Tuple[float, int]:
+    """Decode a search cursor token, raising ValueError if it is malformed"""
+    try:
+        rank, post_id = _decode_token(cursor)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Malformed cursor") from exc
+    if (
+        not isinstance(rank, (int, float))
+        or isinstance(rank, bool)
+        or not math.isfinite(rank)
+        or not _is_cursor_id(post_id)
+    ):
+        raise ValueError("Malformed cursor")
+    return float(rank), post_id
+
+def fts5_query(q: str) -> str:
+    """Quote each search term so user input cannot use FTS5 query syntax"""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in q.split())
+
+class CountCache:
+    """Process-local total count with a TTL that writers can bump in place"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._value: Optional[int] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[int]:
+        with self._lock:
+            if self._value is None or time.monotonic() >= self._expires_at:
+                return None
+            return self._value
+
+    def set(self, value: int) -> None:
+        with self._lock:
+            self._value = value
+            self._expires_at = time.monotonic() + self.ttl
+
+    def increment(self, amount: int = 1) -> None:
+        with self._lock:
+            if self._value is not None:
+                self._value += amount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._value = None
+            self._expires_at = 0.0
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag derived from the given version components"""
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+def post_validators(post_id: int, updated_at: datetime) -> Tuple[str, datetime]:
+    """ETag and Last-Modified for a single post"""
+    return make_etag(post_id, updated_at.isoformat()), updated_at
+
+def page_validators(items: Sequence[Any], *extra: Any) -> Tuple[str, Optional[datetime]]:
+    """ETag for a page of posts (or (id, updated_at) rows); pages have no Last-Modified.
+
+    Deletes and rows shifting between pages change a page without any of
+    its items getting newer, so only the ETag (which covers ``extra``, e.g.
+    the total and cursors) can validate it.
+    """
+    versions = tuple((item.id, item.updated_at.isoformat()) for item in items)
+    return make_etag(versions, *extra), None
+
+def _strip_weak(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+def has_conditional_headers(request: Request, by_date: bool = True) -> bool:
+    """Whether revalidation is worth a lookup; pass ``by_date=False`` for pages, which have no Last-Modified"""
+    if "if-none-match" in request.headers:
+        return True
+    return by_date and "if-modified-since" in request.headers
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Evaluate If-None-Match (weak comparison), else If-Modified-Since"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        tags = {_strip_weak(tag.strip()) for tag in if_none_match.split(",")}
+        return _strip_weak(etag) in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates have one-second resolution
+        return _as_utc(last_modified).replace(microsecond=0) <= since
+    return False
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime]) -> None:
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+
+def not_modified_response(etag: str, last_modified: Optional[datetime]) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_validators(response, etag, last_modified)
+    return response
+
+def _as_utc(value: datetime) -> datetime:
+    # Timestamps are stored as naive UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def as_naive_utc(value: datetime) -> datetime:
+    """Convert to the naive UTC form timestamps are stored in; naive values are taken as UTC"""
+    return _as_utc(value).replace(tzinfo=None)
+
+async def ndjson_lines(batches: AsyncIterator[Sequence]) -> AsyncIterator[str]:
+    """Render batches of post rows as newline-delimited JSON, one chunk per batch"""
+    async for rows in batches:
+        yield "".join(schemas.Post.model_validate(row).model_dump_json() + "\n" for row in rows)
+
+async def csv_lines(batches: AsyncIterator[Sequence], columns: Sequence[str]) -> AsyncIterator[str]:
+    """Render batches of post rows as CSV with a header row, one chunk per batch"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for rows in batches:
+        writer.writerows(
+            [value.isoformat() if isinstance(value, datetime) else value for value in row]
+            for row in rows
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -0,0 +1,103 @@
+"""Production entry point: ``python -m src.serve``.
+
+Runs ``src.main:app`` under uvicorn's multi-process supervisor with the
+worker count, keep-alive, backlog, recycling and shutdown behaviour taken
+from Settings.
+"""
+import glob
+import importlib.util
+import logging
+import os
+import tempfile
+from typing import Any, Dict, Optional
+
+import uvicorn
+
+from src.core.config import Settings, get_settings
+from src.core.security import calibrate_rounds
+
+APP = "src.main:app"
+
+logger = logging.getLogger(__name__)
+
+def available_cpus() -> int:
+    # Respects CPU affinity (e.g. taskset, cgroup cpusets) where the platform exposes it
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+def worker_count(settings: Settings) -> int:
+    return settings.SERVER_WORKERS or available_cpus()
+
+def worker_environment(settings: Settings, workers: int, cpus: Optional[int] = None) -> Dict[str, str]:
+    """Environment overrides that split per-host resources between workers.
+
+    Every worker opens its own connection pool, so DB_MAX_CONNECTIONS (if
+    set) is divided between them. Each also runs its own bcrypt executor,
+    which is sized to its share of the CPUs unless set explicitly.
+    """
+    env = {}
+    if settings.DB_MAX_CONNECTIONS:
+        per_worker = max(1, settings.DB_MAX_CONNECTIONS // workers)
+        pool_size = min(settings.DB_POOL_SIZE, per_worker)
+        env["DB_POOL_SIZE"] = str(pool_size)
+        env["DB_MAX_OVERFLOW"] = str(per_worker - pool_size)
+    if settings.PASSWORD_HASHER_WORKERS is None and workers > 1:
+        env["PASSWORD_HASHER_WORKERS"] = str(max(1, (cpus or available_cpus()) // workers))
+    return env
+
+def uvicorn_options(settings: Settings, workers: int) -> Dict[str, Any]:
+    has_uvloop = importlib.util.find_spec("uvloop") is not None
+    has_httptools = importlib.util.find_spec("httptools") is not None
+    options = {
+        "host": settings.SERVER_HOST,
+        "port": settings.SERVER_PORT,
+        "workers": workers,
+        "loop": "uvloop" if has_uvloop else "asyncio",
+        "http": "httptools" if has_httptools else "h11",
+        "backlog": settings.SERVER_BACKLOG,
+        "timeout_keep_alive": settings.SERVER_KEEPALIVE_TIMEOUT,
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_TIMEOUT,
+        "proxy_headers": True,
+        "access_log": settings.DEBUG,
+        "lifespan": "on",
+    }
+    if settings.SERVER_MAX_REQUESTS > 0:
+        options["limit_max_requests"] = settings.SERVER_MAX_REQUESTS
+        options["limit_max_requests_jitter"] = settings.SERVER_MAX_REQUESTS_JITTER
+    return options
+
+def reset_multiprocess_dir(path: str) -> None:
+    """Remove metric files left by a previous run so its workers are not counted"""
+    for stale in glob.glob(os.path.join(path, "*.db")):
+        os.remove(stale)
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    settings = get_settings()
+    workers = worker_count(settings)
+    os.environ.update(worker_environment(settings, workers))
+    if settings.PASSWORD_BCRYPT_CALIBRATE:
+        # Calibrate once here so every worker hashes (and rehashes) at the same cost
+        rounds = calibrate_rounds(
+            settings.PASSWORD_HASH_TARGET_MS,
+            settings.PASSWORD_BCRYPT_MIN_ROUNDS,
+            settings.PASSWORD_BCRYPT_MAX_ROUNDS
+        )
+        os.environ.update(PASSWORD_BCRYPT_ROUNDS=str(rounds), PASSWORD_BCRYPT_CALIBRATE="False")
+        logger.info("Calibrated bcrypt cost to %d rounds", rounds)
+    if workers > 1:
+        # Must be set before workers import prometheus_client so /metrics sums all of them
+        if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            reset_multiprocess_dir(os.environ["PROMETHEUS_MULTIPROC_DIR"])
+        else:
+            os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+    options = uvicorn_options(settings, workers)
+    logger.info(
+        "Starting %d worker(s) on %s:%s (loop=%s, http=%s)",
+        workers, options["host"], options["port"], options["loop"], options["http"]
+    )
+    uvicorn.run(APP, **options)
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,21 @@ import asyncio
 import warnings
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from testcontainers.postgres import PostgresContainer
 from _pytest.nodes import Item
 from _pytest.runner import CallInfo
 import json
 
 from .test_config import test_settings
-from src.core.database import Base, get_db
+from src.core.database import Base, get_async_db, get_async_database_url, get_db
 from src.main import app
+from src.auth.service import principal_cache
+from src.core.cache import cache
+from src.core.queries import assert_max_queries as _assert_max_queries
+from src.posts.service import post_count_cache
 
 # Define a custom marker for database tests
 def pytest_configure(config):
@@ -68,6 +74,18 @@ def engine(postgres_container):
     finally:
         Base.metadata.drop_all(bind=engine)
 
+@pytest.fixture(scope="session")
+def async_engine(postgres_container):
+    """Create an asyncpg engine against the PostgreSQL container.
+
+    NullPool keeps connections from outliving the event loop of the
+    TestClient that opened them.
+    """
+    return create_async_engine(
+        get_async_database_url(postgres_container.get_connection_url()),
+        poolclass=NullPool
+    )
+
 @pytest.fixture(scope="function")
 def db_session(engine):
     """Creates a new database session for each test."""
@@ -84,16 +102,32 @@ def db_session(engine):
         db.close()
 
 @pytest.fixture(scope="function")
-def client(db_session):
+def client(db_session, async_engine):
     """Create a new FastAPI TestClient that uses the `db_session` fixture to override
-    the `get_db` dependency that is injected into routes."""
+    the `get_db` dependency, and sessions on the test database for `get_async_db`."""
     def override_get_db():
         try:
             yield db_session
         finally:
             pass
 
+    TestingAsyncSessionLocal = async_sessionmaker(
+        bind=async_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False
+    )
+
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    # Tables are truncated between tests, so drop any cached totals and principals
+    post_count_cache.clear()
+    principal_cache.clear()
+    asyncio.run(cache.clear())
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -127,6 +161,15 @@ def test_user_token(client, test_user):
     assert response.status_code == 200, f"Token generation failed: {response.json()}"
     return response.json()["access_token"]
 
+@pytest.fixture
+def assert_max_queries():
+    """Context manager failing the test when its block runs more than n SQL statements.
+
+        with assert_max_queries(2):
+            client.get("/api/v1/posts/")
+    """
+    return _assert_max_queries
+
 # @pytest.fixture(autouse=True)
 # def ignore_crypt_warnings():
 #     warnings.filterwarnings("ignore", category=DeprecationWarning, message=".*crypt.*") 
@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.core.admission import AdmissionControlMiddleware, AdmissionController, AdmissionLimiter, AdmissionRejected
+from src.core.config import AdmissionClass, Settings
+
+async def test_limiter_admits_up_to_limit_then_queues_in_order():
+    limiter = AdmissionLimiter("test", limit=1, queue_size=2, queue_timeout=1)
+    await limiter.acquire()
+    order = []
+
+    async def waiter(n):
+        await limiter.acquire()
+        order.append(n)
+        limiter.release()
+
+    tasks = [asyncio.create_task(waiter(n)) for n in range(2)]
+    await asyncio.sleep(0)
+    assert limiter.queued == 2
+    with pytest.raises(AdmissionRejected) as exc_info:
+        await limiter.acquire()
+    assert exc_info.value.reason == "queue_full"
+
+    limiter.release()
+    await asyncio.gather(*tasks)
+    assert order == [0, 1]
+    assert limiter.active == 0
+    assert limiter.stats()["rejected"] == {"queue_full": 1, "timeout": 0}
+
+async def test_limiter_sheds_requests_that_wait_past_the_deadline():
+    limiter = AdmissionLimiter("test", limit=1, queue_size=5, queue_timeout=0.01)
+    await limiter.acquire()
+    with pytest.raises(AdmissionRejected) as exc_info:
+        await limiter.acquire()
+    assert exc_info.value.reason == "timeout"
+    assert limiter.queued == 0
+    limiter.release()
+    assert limiter.active == 0
+
+async def test_cancelled_waiter_leaves_the_queue():
+    limiter = AdmissionLimiter("test", limit=1, queue_size=5, queue_timeout=5)
+    await limiter.acquire()
+    task = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert limiter.queued == 0
+    limiter.release()
+    assert limiter.active == 0
+
+def test_controller_matches_first_class_and_skips_exempt_paths():
+    controller = AdmissionController(
+        [
+            AdmissionClass(name="auth", paths=["/api/v1/auth/token"], limit=1, queue_size=0, queue_timeout=1),
+            AdmissionClass(name="default", limit=10, queue_size=10, queue_timeout=1),
+        ],
+        exempt_paths=["/health"],
+    )
+    assert controller.classify("/api/v1/auth/token").name == "auth"
+    assert controller.classify("/api/v1/posts/").name == "default"
+    assert controller.classify("/health/ready") is None
+    assert controller.classify("/health") is None
+    assert controller.classify("/healthz-anything").name == "default"
+    assert controller.classify("/api/v1/auth/tokens").name == "default"
+
+def test_default_auth_class_follows_api_prefix():
+    auth = Settings(API_V1_STR="/api/v2").ADMISSION_CLASSES[0]
+    assert auth.name == "auth"
+    assert auth.paths == ["/api/v2/auth/token", "/api/v2/auth/register"]
+
+def test_default_exempt_paths_follow_metrics_path():
+    assert Settings().ADMISSION_EXEMPT_PATHS == ["/health", "/metrics"]
+    assert Settings(METRICS_PATH="/internal/metrics").ADMISSION_EXEMPT_PATHS == ["/health", "/internal/metrics"]
+    assert Settings(ADMISSION_EXEMPT_PATHS=["/ping"]).ADMISSION_EXEMPT_PATHS == ["/ping"]
+
+def test_middleware_holds_a_slot_for_the_whole_request():
+    controller = AdmissionController(
+        [AdmissionClass(name="slow", paths=["/slow"], limit=1, queue_size=0, queue_timeout=1)]
+    )
+    app = FastAPI()
+    app.add_middleware(AdmissionControlMiddleware, controller=controller, retry_after=7)
+
+    @app.get("/slow")
+    async def slow():
+        # Hold the only slot while a second request arrives
+        with pytest.raises(AdmissionRejected):
+            await controller.classify("/slow").acquire()
+        return {"ok": True}
+
+    @app.get("/other")
+    async def other():
+        return {"ok": True}
+
+    client = TestClient(app)
+    assert client.get("/slow").status_code == 200
+    assert client.get("/other").status_code == 200  # Unclassified paths are not limited
+    stats = controller.stats()["slow"]
+    assert stats["active"] == 0
+    assert stats["rejected"]["queue_full"] == 1
+
+def test_middleware_sheds_over_capacity_requests():
+    controller = AdmissionController(
+        [AdmissionClass(name="default", limit=0, queue_size=0, queue_timeout=1)]
+    )
+    app = FastAPI()
+    app.add_middleware(AdmissionControlMiddleware, controller=controller, retry_after=7)
+
+    @app.get("/")
+    async def root():
+        return {}
+
+    response = TestClient(app).get("/")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "7"
+    assert response.json() == {"detail": "Server is busy, please retry shortly"}
@@ -1,6 +1,14 @@
+import asyncio
+
 import pytest
 from fastapi.testclient import TestClient
 from src.main import app
+from src.auth.models import User
+from src.auth.constants import EMAIL_EXISTS_MSG, USERNAME_EXISTS_MSG
+from src.auth.service import principal_cache
+from src.core import database
+from src.core.database import ReplicaRouter
+from src.core.security import bcrypt_rounds, password_hasher
 
 @pytest.mark.db
 def test_register_user(client):
@@ -17,6 +25,25 @@ def test_register_user(client):
     assert data["email"] == "new@example.com"
     assert data["username"] == "newuser"
 
+@pytest.mark.db
+def test_register_is_a_single_insert(client, assert_max_queries):
+    with assert_max_queries(1):
+        response = client.post(
+            "/api/v1/auth/register",
+            json={"email": "single@example.com", "username": "single", "password": "Test123!@#"}
+        )
+    assert response.status_code == 200
+    assert response.json()["is_active"] is True
+
+@pytest.mark.db
+@pytest.mark.parametrize("field, detail", [("email", EMAIL_EXISTS_MSG), ("username", USERNAME_EXISTS_MSG)])
+def test_register_duplicate_returns_400(client, test_user, field, detail):
+    user = {"email": "fresh@example.com", "username": "freshuser", "password": "Test123!@#"}
+    user[field] = test_user[field]
+    response = client.post("/api/v1/auth/register", json=user)
+    assert response.status_code == 400
+    assert response.json()["detail"] == detail
+
 @pytest.mark.db
 def test_create_post(client, test_user_token):
     response = client.post(
@@ -30,4 +57,48 @@ def test_create_post(client, test_user_token):
     assert response.status_code == 200
     data = response.json()
     assert data["title"] == "Test Post"
-    assert data["content"] == "Test Content" 
\ No newline at end of file
+    assert data["content"] == "Test Content" 
+
+@pytest.mark.db
+def test_new_user_authenticates_against_primary(client, test_user, test_user_token, tmp_path, monkeypatch):
+    # The replica is an empty database: a principal lookup routed there would fail
+    router = ReplicaRouter([f"sqlite:///{tmp_path / 'replica.db'}"])
+    monkeypatch.setattr(database, "replica_router", router)
+    try:
+        response = client.post(
+            "/api/v1/posts/",
+            headers={"Authorization": f"Bearer {test_user_token}"},
+            json={"title": "Fresh", "content": "Written right after registering"}
+        )
+        assert response.status_code == 200
+    finally:
+        asyncio.run(router.dispose())
+
+@pytest.mark.db
+def test_principal_cache_invalidated_on_user_change(client, test_user, test_user_token, db_session):
+    headers = {"Authorization": f"Bearer {test_user_token}"}
+    post = {"title": "Cached", "content": "Principal"}
+    assert client.post("/api/v1/posts/", headers=headers, json=post).status_code == 200
+    assert principal_cache.get(test_user_token).username == test_user["username"]
+
+    # ORM updates to the user drop every cached principal for it
+    user = db_session.get(User, test_user["id"])
+    user.is_active = False
+    db_session.commit()
+    assert principal_cache.get(test_user_token) is None
+
+@pytest.mark.db
+def test_login_rehashes_password_to_current_cost(client, test_user, db_session, monkeypatch):
+    user = db_session.get(User, test_user["id"])
+    old_rounds = bcrypt_rounds(user.hashed_password)
+
+    monkeypatch.setattr(password_hasher, "rounds", old_rounds - 1)
+    response = client.post(
+        "/api/v1/auth/token",
+        data={"username": test_user["username"], "password": "Test123!@#"}
+    )
+    assert response.status_code == 200
+
+    db_session.expire_all()
+    user = db_session.get(User, test_user["id"])
+    assert bcrypt_rounds(user.hashed_password) == old_rounds - 1
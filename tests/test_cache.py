@@ -0,0 +1,48 @@
+import time
+
+from src.core.cache import LRUCache, MemoryCacheBackend, NullCacheBackend
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+def test_lru_cache_expires_entries():
+    cache = LRUCache(maxsize=10, ttl=60)
+    cache.set("short", 1, ttl=0.01)
+    cache.set("long", 2)
+    time.sleep(0.02)
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+def test_lru_cache_delete_where():
+    cache = LRUCache(maxsize=10)
+    cache.set("a", {"id": 1})
+    cache.set("b", {"id": 2})
+    cache.set("c", {"id": 1})
+    assert cache.delete_where(lambda value: value["id"] == 1) == 2
+    assert len(cache) == 1
+    assert cache.get("b") == {"id": 2}
+
+async def test_memory_cache_backend_counts_hits_and_misses():
+    backend = MemoryCacheBackend(maxsize=10)
+    assert await backend.get("post:1") is None
+    await backend.set("post:1", "{}", ttl=60)
+    assert await backend.get("post:1") == "{}"
+    await backend.delete("post:1")
+    assert await backend.get("post:1") is None
+
+    stats = backend.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["entries"] == 0
+
+async def test_null_cache_backend_always_misses():
+    backend = NullCacheBackend()
+    await backend.set("post:1", "{}")
+    assert await backend.get("post:1") is None
@@ -0,0 +1,121 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.core.cache import LRUCache
+from src.core.compression import (
+    CompressionMiddleware,
+    Encoder,
+    build_encoders,
+    gzip_encoder,
+    negotiate_encoding,
+)
+
+BIG = {"items": [{"title": "Compressible", "content": "lorem ipsum " * 20}] * 20}
+
+def make_client(encoders=None, cache=None, minimum_size=500):
+    app = FastAPI()
+
+    @app.get("/big")
+    async def big():
+        return BIG
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/tagged")
+    async def tagged(response: Response):
+        response.headers["ETag"] = '"v1"'
+        return BIG
+
+    @app.get("/png")
+    async def png():
+        return Response(b"\x89PNG" * 1000, media_type="image/png")
+
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for i in range(50):
+                yield f'{{"line": {i}, "text": "{"x" * 50}"}}\n'
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    encoders = encoders if encoders is not None else {"gzip": gzip_encoder()}
+    app.add_middleware(CompressionMiddleware, encoders=encoders, minimum_size=minimum_size, cache=cache)
+    return TestClient(app)
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", "gzip"),
+    ("gzip, br", "br"),
+    ("gzip;q=1.0, br;q=0.5", "gzip"),
+    ("*", "br"),
+    ("*, br;q=0", "gzip"),
+    ("identity", None),
+    ("", None),
+])
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header, ["br", "gzip"]) == expected
+
+def test_build_encoders_rejects_unknown_names():
+    assert list(build_encoders(["gzip"])) == ["gzip"]
+    with pytest.raises(ValueError):
+        build_encoders(["lz4"])
+
+def test_compresses_large_json_for_accepting_clients():
+    client = make_client()
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert int(response.headers["Content-Length"]) < len(response.content)
+    assert response.json() == BIG
+
+@pytest.mark.parametrize("path, accept", [
+    ("/big", "identity"),
+    ("/small", "gzip"),
+    ("/png", "gzip"),
+])
+def test_leaves_response_uncompressed(path, accept):
+    response = make_client().get(path, headers={"Accept-Encoding": accept})
+    assert "Content-Encoding" not in response.headers
+
+def test_compresses_streamed_bodies_incrementally():
+    client = make_client()
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert len(gzip.decompress(raw).splitlines()) == 50
+
+def test_compressed_bodies_cached_by_etag():
+    calls = []
+    base = gzip_encoder()
+
+    def counting_compress(body):
+        calls.append(len(body))
+        return base.compress(body)
+
+    client = make_client(
+        encoders={"gzip": Encoder("gzip", counting_compress, base.stream)},
+        cache=LRUCache(maxsize=8)
+    )
+    for _ in range(3):
+        response = client.get("/tagged", headers={"Accept-Encoding": "gzip"})
+        assert response.json() == BIG
+        # A strong ETag is weakened once the bytes are re-encoded
+        assert response.headers["ETag"] == 'W/"v1"'
+    client.get("/big", headers={"Accept-Encoding": "gzip"})
+    client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert len(calls) == 3  # Once for the tagged page, every time for the untagged one
+
+@pytest.mark.parametrize("encoding, module", [("br", "brotli"), ("zstd", "zstandard")])
+def test_optional_encoders(encoding, module):
+    pytest.importorskip(module)
+    client = make_client(encoders=build_encoders([encoding]))
+    response = client.get("/big", headers={"Accept-Encoding": encoding})
+    assert response.headers["Content-Encoding"] == encoding
+    assert response.json() == BIG
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": encoding}) as response:
+        assert len(response.read().splitlines()) == 50
@@ -1,9 +1,76 @@
+import time
+
+import pytest
 from fastapi.testclient import TestClient
-from src.main import app
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+import src.main
+
+from src.core.config import get_settings
+from src.core.security import password_hasher
+from src.main import app, create_app
 
 client = TestClient(app)
 
 def test_read_main():
     response = client.get("/")
     assert response.status_code == 200
-    assert response.json() == {"message": "Welcome to FastAPI Template"} 
\ No newline at end of file
+    assert response.json() == {"message": "Welcome to FastAPI Template"}
+
+def test_liveness():
+    response = client.get("/health/live")
+    assert response.status_code == 200
+    assert response.json() == {"status": "alive"}
+
+def test_readiness_without_lifespan_is_unavailable():
+    # Outside a ``with TestClient(...)`` block the lifespan never ran
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["warmup"] is None
+
+def test_readiness_when_warmup_disabled():
+    settings = get_settings().model_copy(update={"WARMUP_ENABLED": False})
+    with TestClient(create_app(settings)) as test_client:
+        response = test_client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["warmup"]["status"] == "ready"
+
+def test_pool_stats_only_in_debug():
+    for debug, expected in ((False, 404), (True, 200)):
+        settings = get_settings().model_copy(update={"DEBUG": debug})
+        assert TestClient(create_app(settings)).get("/stats/db-pool").status_code == expected
+
+def test_lifespan_calibrates_bcrypt_cost(monkeypatch):
+    monkeypatch.setattr(password_hasher, "rounds", password_hasher.rounds)
+    settings = get_settings().model_copy(update={
+        "WARMUP_ENABLED": False,
+        "PASSWORD_BCRYPT_CALIBRATE": True,
+        "PASSWORD_HASH_TARGET_MS": 0.001,
+        "PASSWORD_BCRYPT_MIN_ROUNDS": 4,
+        "PASSWORD_BCRYPT_MAX_ROUNDS": 6,
+    })
+    with TestClient(create_app(settings)):
+        assert password_hasher.rounds == 4
+
+@pytest.mark.db
+def test_readiness_reports_warmup_steps(engine, async_engine, monkeypatch):
+    # Warm the test database (tables created by ``engine``) instead of the app default
+    monkeypatch.setattr(src.main, "async_engine", async_engine)
+    monkeypatch.setattr(src.main, "AsyncSessionLocal", async_sessionmaker(
+        bind=async_engine, class_=AsyncSession, expire_on_commit=False
+    ))
+    monkeypatch.setattr(src.main, "replica_router", None)
+    test_app = create_app()
+    with TestClient(test_app) as test_client:
+        # Poll: warmup runs in the background after startup
+        for _ in range(100):
+            response = test_client.get("/health/ready")
+            if response.json()["warmup"]["status"] not in ("pending", "warming"):
+                break
+            time.sleep(0.05)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "ready"
+    assert body["warmup"]["error"] is None
+    assert {"openapi", "pool", "statements"} <= set(body["warmup"]["steps_ms"])
+    assert test_app.openapi_schema is not None
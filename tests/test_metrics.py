@@ -0,0 +1,61 @@
+from fastapi import APIRouter, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from src.core.metrics import MetricsMiddleware, render_metrics
+
+def sample(metrics: str, prefix: str) -> float:
+    for line in metrics.splitlines():
+        if line.startswith(prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+def make_client() -> TestClient:
+    engine = create_engine("sqlite://")
+    router = APIRouter(prefix="/things")
+
+    @router.get("/{thing_id}")
+    def read_thing(thing_id: int):
+        if thing_id == 0:
+            raise HTTPException(status_code=404, detail="Not found")
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        return {"id": thing_id}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/metrics-test")
+    app.add_middleware(MetricsMiddleware)
+    return TestClient(app)
+
+def test_requests_are_labelled_by_route_template_and_status():
+    client = make_client()
+    label = 'method="GET",route="/metrics-test/things/{thing_id}"'
+    before = render_metrics().decode()
+    client.get("/metrics-test/things/1")
+    client.get("/metrics-test/things/2")
+    client.get("/metrics-test/things/0")
+    client.get("/metrics-test/unknown")
+    after = render_metrics().decode()
+
+    ok = f'http_requests_total{{{label},status="200"}}'
+    missing = f'http_requests_total{{{label},status="404"}}'
+    unmatched = 'http_requests_total{method="GET",route="<unmatched>",status="404"}'
+    assert sample(after, ok) - sample(before, ok) == 2
+    assert sample(after, missing) - sample(before, missing) == 1
+    assert sample(after, unmatched) - sample(before, unmatched) == 1
+    count = f"http_request_duration_seconds_count{{{label}}}"
+    assert sample(after, count) - sample(before, count) == 3
+    assert "/metrics-test/things/1" not in after
+
+def test_db_time_is_attributed_to_the_request():
+    client = make_client()
+    label = 'method="GET",route="/metrics-test/things/{thing_id}"'
+    before = render_metrics().decode()
+    client.get("/metrics-test/things/1")
+    after = render_metrics().decode()
+
+    assert sample(after, "db_queries_total") - sample(before, "db_queries_total") >= 2
+    db_sum = f"http_request_db_seconds_sum{{{label}}}"
+    assert sample(after, db_sum) > sample(before, db_sum)
+    assert sample(after, 'http_requests_in_flight{method="GET"}') == 0
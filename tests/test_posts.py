@@ -1,9 +1,16 @@
+import csv
+import io
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
 import pytest
 from fastapi.testclient import TestClient
 from src.main import app
 from typing import List, Dict
 import math
 from sqlalchemy import text
+from src.core.cache import cache
+from src.posts import utils
 
 def create_bulk_posts(client: TestClient, token: str, count: int) -> List[Dict]:
     """Create a specified number of posts and return their data."""
@@ -172,3 +179,286 @@ def test_create_and_get_posts(client, test_user_token):
     assert second_found["title"] == "Second Test Post"
     assert second_found["content"] == "Second Test Content"
 
+
+@pytest.mark.db
+def test_cursor_pagination(client, test_user_token):
+    TOTAL_POSTS = 25
+    PAGE_SIZE = 10
+    created_posts = create_bulk_posts(client, test_user_token, TOTAL_POSTS)
+    created_ids = sorted((post["id"] for post in created_posts), reverse=True)
+
+    # Walk forward through every page
+    pages = []
+    cursor = None
+    while True:
+        params = {"size": PAGE_SIZE}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/posts/cursor", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        pages.append(data)
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    fetched_ids = [post["id"] for page in pages for post in page["items"]]
+    assert fetched_ids == created_ids
+    assert len(pages) == math.ceil(TOTAL_POSTS / PAGE_SIZE)
+    assert pages[0]["prev_cursor"] is None
+
+    # Walk back from the second page to the first
+    response = client.get(
+        "/api/v1/posts/cursor",
+        params={"size": PAGE_SIZE, "cursor": pages[1]["prev_cursor"]}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [post["id"] for post in data["items"]] == created_ids[:PAGE_SIZE]
+    assert data["prev_cursor"] is None
+
+@pytest.mark.db
+def test_invalid_cursor_is_rejected(client):
+    response = client.get("/api/v1/posts/cursor", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+    # Well-formed but with an id no INTEGER column can hold
+    cursor = utils.encode_cursor(datetime(2020, 1, 1), 2**70)
+    response = client.get("/api/v1/posts/cursor", params={"cursor": cursor})
+    assert response.status_code == 400
+
+@pytest.mark.db
+def test_posts_count_modes(client, test_user_token):
+    create_bulk_posts(client, test_user_token, 3)
+
+    exact = client.get("/api/v1/posts/", params={"count": "exact", "size": 2}).json()
+    assert exact["total"] == 3
+    assert exact["pages"] == 2
+    assert exact["approximate"] is False
+
+    estimate = client.get("/api/v1/posts/", params={"count": "estimate", "size": 2}).json()
+    assert estimate["total"] == 3
+    assert estimate["approximate"] is True
+
+    # The cached total is bumped by create_post instead of being recounted
+    create_bulk_posts(client, test_user_token, 1)
+    estimate = client.get("/api/v1/posts/", params={"count": "estimate"}).json()
+    assert estimate["total"] == 4
+
+    uncounted = client.get("/api/v1/posts/", params={"count": "none"}).json()
+    assert uncounted["total"] is None
+    assert uncounted["pages"] is None
+    assert len(uncounted["items"]) == 4
+
+@pytest.mark.db
+def test_read_post_is_served_from_cache(client, test_user_token):
+    created = create_bulk_posts(client, test_user_token, 1)[0]
+    hits = cache.hits
+
+    first = client.get(f"/api/v1/posts/{created['id']}")
+    second = client.get(f"/api/v1/posts/{created['id']}")
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json() == created
+    assert cache.hits == hits + 1
+
+@pytest.mark.db
+def test_conditional_get_returns_not_modified(client, test_user_token):
+    created = create_bulk_posts(client, test_user_token, 3)
+
+    for url in (
+        f"/api/v1/posts/{created[0]['id']}",
+        "/api/v1/posts/?size=2",
+        "/api/v1/posts/cursor?size=2",
+    ):
+        response = client.get(url)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+
+        not_modified = client.get(url, headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified.headers["ETag"] == etag
+        assert not_modified.content == b""
+        assert client.get(url, headers={"If-None-Match": 'W/"stale"'}).status_code == 200
+
+    # Single posts also validate by date; pages only by ETag
+    response = client.get(f"/api/v1/posts/{created[0]['id']}")
+    last_modified = response.headers["Last-Modified"]
+    assert client.get(
+        f"/api/v1/posts/{created[0]['id']}", headers={"If-Modified-Since": last_modified}
+    ).status_code == 304
+    page = client.get("/api/v1/posts/?size=2")
+    assert "Last-Modified" not in page.headers
+    assert client.get(
+        "/api/v1/posts/?size=2", headers={"If-Modified-Since": last_modified}
+    ).status_code == 200
+
+    # A new post changes the listing's validator
+    response = client.get("/api/v1/posts/?size=10")
+    etag = response.headers["ETag"]
+    create_bulk_posts(client, test_user_token, 1)
+    assert client.get("/api/v1/posts/?size=10", headers={"If-None-Match": etag}).status_code == 200
+
+@pytest.mark.db
+def test_bulk_posts_endpoint(client, test_user_token, db_session):
+    TOTAL_POSTS = 1203  # Spans several insert chunks
+    payload = [
+        {"title": f"Bulk Post {i+1}", "content": f"Bulk Content {i+1}"}
+        for i in range(TOTAL_POSTS)
+    ]
+    response = client.post(
+        "/api/v1/posts/bulk",
+        headers={"Authorization": f"Bearer {test_user_token}"},
+        json=payload
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == TOTAL_POSTS
+    ids = [item["id"] for item in data["items"]]
+    assert len(set(ids)) == TOTAL_POSTS
+    assert all(item["created_at"] and item["updated_at"] for item in data["items"])
+
+    # Returned ids follow the order of the submitted posts
+    rows = db_session.execute(text("SELECT id, title FROM posts ORDER BY id")).all()
+    titles_by_id = {row.id: row.title for row in rows}
+    assert [titles_by_id[post_id] for post_id in ids] == [post["title"] for post in payload]
+
+@pytest.mark.db
+def test_bulk_posts_rejects_empty_batch(client, test_user_token):
+    response = client.post(
+        "/api/v1/posts/bulk",
+        headers={"Authorization": f"Bearer {test_user_token}"},
+        json=[]
+    )
+    assert response.status_code == 422
+
+@pytest.mark.db
+def test_export_posts_streams_ndjson_and_csv(client, test_user, test_user_token):
+    create_bulk_posts(client, test_user_token, 3)
+
+    response = client.get("/api/v1/posts/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["title"] for row in rows] == ["Test Post 1", "Test Post 2", "Test Post 3"]
+
+    response = client.get("/api/v1/posts/export", params={"format": "csv", "author_id": test_user["id"]})
+    assert response.status_code == 200
+    records = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(records) == 3
+    assert records[0]["content"] == "Test Content for post 1"
+
+    response = client.get("/api/v1/posts/export", params={"author_id": test_user["id"] + 1000})
+    assert response.text == ""
+
+@pytest.mark.db
+def test_export_posts_accepts_timezone_aware_bounds(client, test_user_token):
+    create_bulk_posts(client, test_user_token, 2)
+    now = datetime.now(timezone.utc)
+    an_hour_ago = (now - timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    in_an_hour = (now + timedelta(hours=1)).astimezone(timezone(timedelta(hours=2))).isoformat()
+
+    response = client.get("/api/v1/posts/export", params={"created_after": an_hour_ago, "created_before": in_an_hour})
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == 2
+
+    # A +02:00 bound from five minutes ago excludes the posts just created
+    just_now = (now - timedelta(minutes=5)).astimezone(timezone(timedelta(hours=2))).isoformat()
+    response = client.get("/api/v1/posts/export", params={"created_before": just_now})
+    assert response.status_code == 200
+    assert response.text == ""
+
+@pytest.mark.db
+def test_search_posts_ranked_with_snippets(client, test_user_token):
+    headers = {"Authorization": f"Bearer {test_user_token}"}
+    documents = [
+        {"title": "Database indexing", "content": "A GIN index keeps database search fast"},
+        {"title": "Cooking pasta", "content": "Boil water and cook the pasta"},
+        {"title": "Async drivers", "content": "asyncpg talks to the database without blocking"},
+    ]
+    response = client.post("/api/v1/posts/bulk", headers=headers, json=documents * 2)
+    assert response.status_code == 200
+
+    hits = []
+    cursor = None
+    while True:
+        params = {"q": "database", "size": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/posts/search", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        hits.extend(data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(hits) == 4
+    assert len({hit["id"] for hit in hits}) == 4
+    assert all("pasta" not in hit["content"] for hit in hits)
+    assert all("<mark>" in hit["snippet"] for hit in hits)
+    ranks = [hit["rank"] for hit in hits]
+    assert ranks == sorted(ranks, reverse=True)
+
+    response = client.get("/api/v1/posts/search", params={"q": "nonexistentterm"})
+    assert response.json()["items"] == []
+
+    for cursor in (utils.encode_search_cursor(1.0, 2**70), utils.encode_search_cursor(float("nan"), 1)):
+        response = client.get("/api/v1/posts/search", params={"q": "database", "cursor": cursor})
+        assert response.status_code == 400
+
+@pytest.mark.db
+def test_author_feeds(client, test_user, test_user_token):
+    other = {
+        "email": f"other{uuid.uuid4().hex[:8]}@example.com",
+        "username": f"other{uuid.uuid4().hex[:8]}",
+        "password": "Test123!@#"
+    }
+    assert client.post("/api/v1/auth/register", json=other).status_code == 200
+    other_token = client.post(
+        "/api/v1/auth/token",
+        data={"username": other["username"], "password": other["password"]}
+    ).json()["access_token"]
+
+    mine = create_bulk_posts(client, test_user_token, 12)
+    create_bulk_posts(client, other_token, 3)
+
+    # Newest first, paged by cursor, only the requested author's posts
+    first = client.get(f"/api/v1/users/{test_user['id']}/posts", params={"size": 10}).json()
+    second = client.get(
+        f"/api/v1/users/{test_user['id']}/posts",
+        params={"size": 10, "cursor": first["next_cursor"]}
+    ).json()
+    fetched_ids = [post["id"] for post in first["items"] + second["items"]]
+    assert fetched_ids == [post["id"] for post in reversed(mine)]
+    assert second["next_cursor"] is None
+
+    response = client.get("/api/v1/me/posts", headers={"Authorization": f"Bearer {other_token}"})
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 3
+    assert client.get("/api/v1/me/posts").status_code == 401
+
+@pytest.mark.db
+def test_post_endpoints_query_budgets(client, test_user, test_user_token, assert_max_queries):
+    headers = {"Authorization": f"Bearer {test_user_token}"}
+    # Principal lookup, INSERT, refresh
+    with assert_max_queries(3):
+        post = client.post("/api/v1/posts/", json={"title": "Budget", "content": "Query budget"}, headers=headers).json()
+    create_bulk_posts(client, test_user_token, 20)
+    since = {"If-Modified-Since": "Wed, 01 Jan 2100 00:00:00 GMT"}
+
+    with assert_max_queries(1):
+        assert client.get(f"/api/v1/posts/{post['id']}").status_code == 200
+    with assert_max_queries(0):
+        assert client.get(f"/api/v1/posts/{post['id']}").status_code == 200
+    # One COUNT plus one page, regardless of page size
+    with assert_max_queries(2):
+        assert len(client.get("/api/v1/posts/", params={"size": 20}).json()["items"]) == 20
+    # Pages only revalidate by ETag, so a date-only condition costs no extra query
+    with assert_max_queries(2):
+        assert client.get("/api/v1/posts/", params={"size": 20}, headers=since).status_code == 200
+    with assert_max_queries(1):
+        assert client.get("/api/v1/posts/cursor", params={"size": 20}).status_code == 200
+    with assert_max_queries(1):
+        assert client.get("/api/v1/posts/cursor", params={"size": 20}, headers=since).status_code == 200
+    with assert_max_queries(1):
+        assert client.get(f"/api/v1/users/{test_user['id']}/posts", params={"size": 20}).status_code == 200
@@ -0,0 +1,67 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from src.core.queries import REPEATS_EXPECTED, QueryDebugMiddleware, assert_max_queries, track_queries
+
+engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+
+def make_client(repeat_threshold: int = 3) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/items/{count}")
+    def read_items(count: int):
+        with engine.connect() as conn:
+            for i in range(count):
+                conn.execute(text("SELECT :i"), {"i": i})
+        return {"count": count}
+
+    app.add_middleware(QueryDebugMiddleware, repeat_threshold=repeat_threshold)
+    return TestClient(app)
+
+def test_track_queries_counts_statements_and_time():
+    with track_queries() as stats:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 1"))
+            with track_queries() as nested:
+                conn.execute(text("SELECT 2"))
+    assert nested is stats
+    assert stats.count == 3
+    assert stats.seconds > 0
+    assert stats.repeated(2) == [("SELECT 1", 2)]
+
+def test_expected_repeats_are_counted_but_not_flagged():
+    with track_queries() as stats:
+        with engine.connect() as conn:
+            for i in range(3):
+                conn.execute(text("SELECT :i").execution_options(**{REPEATS_EXPECTED: True}), {"i": i})
+    assert stats.count == 3
+    assert stats.repeated(2) == []
+
+def test_debug_middleware_reports_queries_in_headers():
+    response = make_client().get("/items/2")
+    assert response.headers["X-DB-Queries"] == "2"
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+    assert 'desc="2 queries"' in response.headers["Server-Timing"]
+
+def test_debug_middleware_warns_on_repeated_statements(caplog):
+    client = make_client(repeat_threshold=3)
+    with caplog.at_level(logging.WARNING, logger="src.core.queries"):
+        client.get("/items/2")
+        assert not caplog.records
+        client.get("/items/3")
+    assert len(caplog.records) == 1
+    assert "ran 3 times" in caplog.records[0].getMessage()
+
+def test_assert_max_queries_counts_across_threads():
+    client = make_client()
+    with assert_max_queries(2):
+        client.get("/items/2")
+    with pytest.raises(AssertionError, match="at most 2 queries, 3 executed"):
+        with assert_max_queries(2):
+            client.get("/items/3")
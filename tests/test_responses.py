@@ -0,0 +1,58 @@
+from datetime import datetime
+from typing import List
+
+from fastapi import APIRouter, FastAPI, Response
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from src.core.responses import FastJSONRoute, ORJSONResponse
+
+class Item(BaseModel):
+    id: int
+    name: str
+    created_at: datetime
+
+class Row:
+    def __init__(self, id: int, name: str):
+        self.id = id
+        self.name = name
+        self.created_at = datetime(2024, 1, 1, 12, 0, 0)
+
+def make_client() -> TestClient:
+    default_router = APIRouter()
+    fast_router = APIRouter(prefix="/fast", route_class=FastJSONRoute, default_response_class=ORJSONResponse)
+
+    for router in (default_router, fast_router):
+        @router.get("/items", response_model=List[Item])
+        def list_items(response: Response):
+            response.headers["X-Custom"] = "yes"
+            return [Row(1, "a"), Row(2, "b")]
+
+        @router.post("/items", response_model=Item, status_code=201)
+        async def create_item():
+            return Row(3, "c")
+
+        @router.get("/empty", response_model=Item)
+        async def empty():
+            return Response(status_code=304)
+
+    app = FastAPI()
+    app.include_router(default_router)
+    app.include_router(fast_router)
+    return TestClient(app)
+
+def test_fast_route_matches_default_serialization():
+    client = make_client()
+    default = client.get("/items")
+    fast = client.get("/fast/items")
+    assert fast.status_code == default.status_code == 200
+    assert fast.json() == default.json()
+    assert fast.headers["X-Custom"] == "yes"
+    assert fast.headers["content-type"] == "application/json"
+
+def test_fast_route_keeps_status_code_and_passes_responses_through():
+    client = make_client()
+    created = client.post("/fast/items")
+    assert created.status_code == 201
+    assert created.json()["id"] == 3
+    assert client.get("/fast/empty").status_code == 304
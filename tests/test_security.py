@@ -0,0 +1,95 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from jose import JWTError, jwt
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError
+
+from src.core.security import (
+    PasswordHasher,
+    PasswordHasherBusyError,
+    TokenCodec,
+    _checkpw,
+    _hashpw,
+    bcrypt_rounds,
+    calibrate_rounds,
+    get_password_hash,
+    needs_rehash,
+    password_hasher,
+    verify_password,
+)
+
+async def test_password_hash_roundtrip():
+    hashed = await get_password_hash("Test123!@#")
+    assert await verify_password("Test123!@#", hashed)
+    assert not await verify_password("wrong-password", hashed)
+
+async def test_password_hash_uses_configured_rounds(monkeypatch):
+    monkeypatch.setattr(password_hasher, "rounds", 5)
+    hashed = await get_password_hash("Test123!@#")
+    assert bcrypt_rounds(hashed) == 5
+    assert not needs_rehash(hashed)
+    assert needs_rehash(_hashpw("Test123!@#", 4))
+
+def test_bcrypt_rounds_of_non_bcrypt_hash():
+    assert bcrypt_rounds("not-a-hash") is None
+
+def test_calibrate_rounds_stays_within_bounds():
+    assert calibrate_rounds(target_ms=0.001, min_rounds=4, max_rounds=8) == 4
+    assert calibrate_rounds(target_ms=10_000, min_rounds=4, max_rounds=6) == 6
+
+async def test_password_hasher_rejects_when_saturated():
+    hasher = PasswordHasher(max_workers=1, queue_depth=1)
+    release = threading.Event()
+    try:
+        running = asyncio.ensure_future(hasher.run(release.wait))
+        queued = asyncio.ensure_future(hasher.run(release.wait))
+        await asyncio.sleep(0.05)
+        assert hasher.pending == 2
+
+        with pytest.raises(PasswordHasherBusyError) as exc_info:
+            await hasher.run(release.wait)
+        assert exc_info.value.status_code == 503
+        assert "Retry-After" in exc_info.value.headers
+
+        release.set()
+        await asyncio.gather(running, queued)
+        assert hasher.pending == 0
+    finally:
+        release.set()
+        hasher.shutdown()
+
+async def test_password_hasher_process_mode():
+    hasher = PasswordHasher(mode="process", max_workers=1)
+    try:
+        hashed = await hasher.run(_hashpw, "Test123!@#")
+        assert await hasher.run(_checkpw, "Test123!@#", hashed)
+    finally:
+        hasher.shutdown()
+
+def test_token_codec_is_compatible_with_jose():
+    codec = TokenCodec("secret", "HS256")
+    claims = {"sub": "alice", "exp": datetime.utcnow() + timedelta(minutes=5)}
+    token = codec.encode(claims)
+    assert token == jwt.encode(claims, "secret", algorithm="HS256")
+    assert jwt.decode(token, "secret", algorithms=["HS256"])["sub"] == "alice"
+    assert codec.decode(jwt.encode(claims, "secret", algorithm="HS256", headers={"kid": "1"}))["sub"] == "alice"
+
+@pytest.mark.parametrize("token, error", [
+    (jwt.encode({"sub": "alice"}, "other-secret"), JWTError),
+    (jwt.encode({"sub": "alice"}, "secret", algorithm="HS512"), JWTError),
+    (jwt.encode({"sub": "alice", "exp": 1}, "secret"), ExpiredSignatureError),
+    (jwt.encode({"sub": 42}, "secret"), JWTClaimsError),
+    ("not-a-token", JWTError),
+])
+def test_token_codec_rejects_invalid_tokens(token, error):
+    with pytest.raises(error):
+        TokenCodec("secret", "HS256").decode(token)
+
+def test_token_codec_leeway():
+    token = jwt.encode({"sub": "alice", "exp": int(time.time()) - 5}, "secret")
+    with pytest.raises(ExpiredSignatureError):
+        TokenCodec("secret").decode(token)
+    assert TokenCodec("secret", leeway=30).decode(token)["sub"] == "alice"
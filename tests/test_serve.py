@@ -0,0 +1,44 @@
+from src.core.config import get_settings
+from src.serve import reset_multiprocess_dir, uvicorn_options, worker_environment
+
+def make_settings(**overrides):
+    return get_settings().model_copy(update=overrides)
+
+def test_connection_budget_is_split_between_workers():
+    settings = make_settings(DB_MAX_CONNECTIONS=100, DB_POOL_SIZE=20, PASSWORD_HASHER_WORKERS=2)
+    assert worker_environment(settings, workers=4) == {"DB_POOL_SIZE": "20", "DB_MAX_OVERFLOW": "5"}
+    assert worker_environment(settings, workers=10) == {"DB_POOL_SIZE": "10", "DB_MAX_OVERFLOW": "0"}
+
+def test_password_hasher_threads_follow_cpu_share():
+    settings = make_settings(DB_MAX_CONNECTIONS=None, PASSWORD_HASHER_WORKERS=None)
+    assert worker_environment(settings, workers=4, cpus=8) == {"PASSWORD_HASHER_WORKERS": "2"}
+    assert worker_environment(settings, workers=1, cpus=8) == {}
+
+def test_uvicorn_options_from_settings():
+    settings = make_settings(
+        SERVER_PORT=9000,
+        SERVER_BACKLOG=4096,
+        SERVER_KEEPALIVE_TIMEOUT=15,
+        SERVER_MAX_REQUESTS=5000,
+        SERVER_MAX_REQUESTS_JITTER=500,
+        SERVER_GRACEFUL_TIMEOUT=20
+    )
+    options = uvicorn_options(settings, workers=3)
+    assert options["workers"] == 3
+    assert options["port"] == 9000
+    assert options["backlog"] == 4096
+    assert options["timeout_keep_alive"] == 15
+    assert options["limit_max_requests"] == 5000
+    assert options["limit_max_requests_jitter"] == 500
+    assert options["timeout_graceful_shutdown"] == 20
+    assert options["loop"] in ("uvloop", "asyncio")
+
+def test_worker_recycling_can_be_disabled():
+    assert "limit_max_requests" not in uvicorn_options(make_settings(SERVER_MAX_REQUESTS=0), workers=1)
+
+def test_reset_multiprocess_dir_removes_stale_metric_files(tmp_path):
+    (tmp_path / "gauge_livesum_123.db").write_bytes(b"")
+    (tmp_path / "counter_123.db").write_bytes(b"")
+    (tmp_path / "keep.txt").write_text("x")
+    reset_multiprocess_dir(str(tmp_path))
+    assert [p.name for p in tmp_path.iterdir()] == ["keep.txt"]